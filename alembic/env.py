@@ -14,7 +14,7 @@ from app.models.feed import CameraFeed, FeedSettings  # noqa
 from app.models.contact import AlertContact  # noqa
 from app.models.alert import Alert, AlertAIAnalysis, AlertAction  # noqa
 from app.models.log import SystemLog  # noqa
-from app.models.analytics import SystemMetric, Detection, AgentSession  # noqa
+from app.models.analytics import SystemMetric, Detection, AgentSession, DailyStat  # noqa
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
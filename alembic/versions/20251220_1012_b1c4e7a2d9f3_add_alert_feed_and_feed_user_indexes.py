@@ -0,0 +1,29 @@
+"""add alert feed and feed user indexes
+
+Revision ID: b1c4e7a2d9f3
+Revises: 79e463f1092b
+Create Date: 2025-12-20 10:12:31.482913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b1c4e7a2d9f3'
+down_revision: Union[str, Sequence[str], None] = '79e463f1092b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_alerts_feed_id'), 'alerts', ['feed_id'], unique=False)
+    op.create_index(op.f('ix_camera_feeds_user_id'), 'camera_feeds', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_camera_feeds_user_id'), table_name='camera_feeds')
+    op.drop_index(op.f('ix_alerts_feed_id'), table_name='alerts')
@@ -0,0 +1,28 @@
+"""add alerts created id index
+
+Revision ID: 5e8a3c1f7b64
+Revises: b1c4e7a2d9f3
+Create Date: 2025-12-20 11:40:07.613254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8a3c1f7b64'
+down_revision: Union[str, Sequence[str], None] = 'b1c4e7a2d9f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_alerts_created_id', 'alerts', [sa.text('created_at DESC'), sa.text('id DESC')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_alerts_created_id', table_name='alerts')
@@ -0,0 +1,57 @@
+"""create daily stats table
+
+Revision ID: c93d0f6e2a17
+Revises: 5e8a3c1f7b64
+Create Date: 2025-12-20 14:25:48.019362
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c93d0f6e2a17'
+down_revision: Union[str, Sequence[str], None] = '5e8a3c1f7b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('daily_stats',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('feed_id', sa.UUID(), nullable=False),
+    sa.Column('calls', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('sms', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('detections', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['feed_id'], ['camera_feeds.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('day', 'feed_id')
+    )
+
+    # Backfill the rollup from existing detections and alert actions (UTC days)
+    op.execute("""
+        INSERT INTO daily_stats (day, feed_id, calls, sms, detections)
+        SELECT day, feed_id, SUM(calls), SUM(sms), SUM(detections)
+        FROM (
+            SELECT (d.timestamp AT TIME ZONE 'UTC')::date AS day, d.feed_id,
+                   0 AS calls, 0 AS sms, COUNT(*) AS detections
+            FROM detections d
+            GROUP BY 1, 2
+            UNION ALL
+            SELECT (aa.created_at AT TIME ZONE 'UTC')::date AS day, a.feed_id,
+                   COUNT(*) FILTER (WHERE aa.action_type = 'call') AS calls,
+                   COUNT(*) FILTER (WHERE aa.action_type = 'sms') AS sms,
+                   0 AS detections
+            FROM alert_actions aa
+            JOIN alerts a ON aa.alert_id = a.id
+            GROUP BY 1, 2
+        ) AS counts
+        GROUP BY day, feed_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('daily_stats')
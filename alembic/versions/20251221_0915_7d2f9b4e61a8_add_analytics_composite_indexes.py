@@ -0,0 +1,34 @@
+"""add analytics composite indexes
+
+Revision ID: 7d2f9b4e61a8
+Revises: c93d0f6e2a17
+Create Date: 2025-12-21 09:15:22.734105
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2f9b4e61a8'
+down_revision: Union[str, Sequence[str], None] = 'c93d0f6e2a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_detections_feed_timestamp', 'detections', ['feed_id', sa.text('timestamp DESC')], unique=False)
+    op.create_index('ix_alerts_feed_created', 'alerts', ['feed_id', sa.text('created_at DESC')], unique=False)
+    op.create_index('ix_alerts_active_feed', 'alerts', ['feed_id'], unique=False, postgresql_where=sa.text("status = 'active'"))
+    op.create_index('ix_alert_actions_type_created', 'alert_actions', ['action_type', sa.text('created_at DESC')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_alert_actions_type_created', table_name='alert_actions')
+    op.drop_index('ix_alerts_active_feed', table_name='alerts')
+    op.drop_index('ix_alerts_feed_created', table_name='alerts')
+    op.drop_index('ix_detections_feed_timestamp', table_name='detections')
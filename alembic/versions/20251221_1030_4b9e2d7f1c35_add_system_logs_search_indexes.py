@@ -0,0 +1,37 @@
+"""add system logs search indexes
+
+Revision ID: 4b9e2d7f1c35
+Revises: 7d2f9b4e61a8
+Create Date: 2025-12-21 10:30:48.219554
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b9e2d7f1c35'
+down_revision: Union[str, Sequence[str], None] = '7d2f9b4e61a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('ix_logs_message_trgm', 'system_logs', ['message'], unique=False, postgresql_using='gin', postgresql_ops={'message': 'gin_trgm_ops'})
+    op.create_index('ix_logs_details_trgm', 'system_logs', ['details'], unique=False, postgresql_using='gin', postgresql_ops={'details': 'gin_trgm_ops'})
+    # (source, level, created_at DESC) serves filtered, newest-first listing and
+    # covers every lookup the old (source, level) index did
+    op.create_index('ix_logs_source_level_created', 'system_logs', ['source', 'level', sa.text('created_at DESC')], unique=False)
+    op.drop_index('ix_logs_source_level', table_name='system_logs')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_logs_source_level', 'system_logs', ['source', 'level'], unique=False)
+    op.drop_index('ix_logs_source_level_created', table_name='system_logs')
+    op.drop_index('ix_logs_details_trgm', table_name='system_logs')
+    op.drop_index('ix_logs_message_trgm', table_name='system_logs')
@@ -0,0 +1,41 @@
+"""add system_metrics feed created index
+
+Revision ID: e5a1c8d3b027
+Revises: 4b9e2d7f1c35
+Create Date: 2025-12-21 11:45:08.512390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a1c8d3b027'
+down_revision: Union[str, Sequence[str], None] = '4b9e2d7f1c35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # system_metrics takes constant agent writes; build without locking them out
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_system_metrics_feed_created',
+            'system_metrics',
+            ['feed_id', sa.text('created_at DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_system_metrics_feed_created',
+            table_name='system_metrics',
+            postgresql_concurrently=True,
+        )
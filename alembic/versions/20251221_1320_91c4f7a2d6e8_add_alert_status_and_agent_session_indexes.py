@@ -0,0 +1,45 @@
+"""add alert status and agent session indexes
+
+Revision ID: 91c4f7a2d6e8
+Revises: e5a1c8d3b027
+Create Date: 2025-12-21 13:20:41.207653
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '91c4f7a2d6e8'
+down_revision: Union[str, Sequence[str], None] = 'e5a1c8d3b027'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_alerts_feed_status_created',
+            'alerts',
+            ['feed_id', 'status', sa.text('created_at DESC')],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_agent_sessions_active_feed',
+            'agent_sessions',
+            ['feed_id', sa.text('started_at DESC')],
+            unique=False,
+            postgresql_where=sa.text("status = 'active'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_agent_sessions_active_feed', table_name='agent_sessions', postgresql_concurrently=True)
+        op.drop_index('ix_alerts_feed_status_created', table_name='alerts', postgresql_concurrently=True)
@@ -0,0 +1,44 @@
+"""add system_logs entity indexes
+
+Revision ID: 3f8e6b1d9c52
+Revises: 91c4f7a2d6e8
+Create Date: 2025-12-21 14:10:17.640921
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8e6b1d9c52'
+down_revision: Union[str, Sequence[str], None] = '91c4f7a2d6e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # system_logs is append-heavy; build without blocking writers
+    with op.get_context().autocommit_block():
+        for column in ('feed_id', 'user_id', 'alert_id'):
+            op.create_index(
+                f'ix_logs_{column.removesuffix("_id")}_created',
+                'system_logs',
+                [column, sa.text('created_at DESC')],
+                unique=False,
+                postgresql_where=sa.text(f'{column} IS NOT NULL'),
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for column in ('alert_id', 'user_id', 'feed_id'):
+            op.drop_index(
+                f'ix_logs_{column.removesuffix("_id")}_created',
+                table_name='system_logs',
+                postgresql_concurrently=True,
+            )
@@ -0,0 +1,60 @@
+"""convert json columns to jsonb
+
+Revision ID: b6d0a3e9f418
+Revises: 3f8e6b1d9c52
+Create Date: 2025-12-21 15:00:52.318406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d0a3e9f418'
+down_revision: Union[str, Sequence[str], None] = '3f8e6b1d9c52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSON_COLUMNS = (
+    ('detections', 'context_tags'),
+    ('detections', 'bounding_box'),
+    ('alert_ai_analysis', 'detected_objects'),
+    ('alert_ai_analysis', 'risk_factors'),
+    ('alert_ai_analysis', 'recommendations'),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            existing_type=sa.JSON(),
+            type_=postgresql.JSONB(),
+            postgresql_using=f'{column}::jsonb',
+        )
+    op.create_index(
+        'ix_detections_context_tags',
+        'detections',
+        ['context_tags'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'context_tags': 'jsonb_path_ops'},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_detections_context_tags', table_name='detections')
+    for table, column in JSON_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            existing_type=postgresql.JSONB(),
+            type_=sa.JSON(),
+            postgresql_using=f'{column}::json',
+        )
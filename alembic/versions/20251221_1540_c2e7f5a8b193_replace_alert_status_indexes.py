@@ -0,0 +1,48 @@
+"""replace alert status indexes
+
+Revision ID: c2e7f5a8b193
+Revises: b6d0a3e9f418
+Create Date: 2025-12-21 15:40:26.904175
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e7f5a8b193'
+down_revision: Union[str, Sequence[str], None] = 'b6d0a3e9f418'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_alerts_active_feed_created',
+            'alerts',
+            ['feed_id', sa.text('created_at DESC')],
+            unique=False,
+            postgresql_where=sa.text("status = 'active'"),
+            postgresql_concurrently=True,
+        )
+        op.drop_index('ix_alerts_active_feed', table_name='alerts', postgresql_concurrently=True)
+        op.drop_index('ix_alerts_status', table_name='alerts', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_alerts_status', 'alerts', ['status'], unique=False, postgresql_concurrently=True)
+        op.create_index(
+            'ix_alerts_active_feed',
+            'alerts',
+            ['feed_id'],
+            unique=False,
+            postgresql_where=sa.text("status = 'active'"),
+            postgresql_concurrently=True,
+        )
+        op.drop_index('ix_alerts_active_feed_created', table_name='alerts', postgresql_concurrently=True)
@@ -0,0 +1,50 @@
+"""cascade feed and alert foreign keys
+
+Revision ID: 4a9d2e7c1f60
+Revises: c2e7f5a8b193
+Create Date: 2025-12-21 16:20:13.518402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a9d2e7c1f60'
+down_revision: Union[str, Sequence[str], None] = 'c2e7f5a8b193'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, column, referred table)
+FOREIGN_KEYS = [
+    ('feed_settings', 'feed_id', 'camera_feeds'),
+    ('alert_contacts', 'feed_id', 'camera_feeds'),
+    ('alerts', 'feed_id', 'camera_feeds'),
+    ('detections', 'feed_id', 'camera_feeds'),
+    ('agent_sessions', 'feed_id', 'camera_feeds'),
+    ('system_metrics', 'feed_id', 'camera_feeds'),
+    ('system_logs', 'feed_id', 'camera_feeds'),
+    ('alert_ai_analysis', 'alert_id', 'alerts'),
+    ('alert_actions', 'alert_id', 'alerts'),
+    ('detections', 'alert_id', 'alerts'),
+    ('system_logs', 'alert_id', 'alerts'),
+]
+
+
+def _recreate(ondelete: Union[str, None]) -> None:
+    for table, column, referred in FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.create_foreign_key(name, table, referred, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _recreate('CASCADE')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _recreate(None)
@@ -0,0 +1,37 @@
+"""add active camera feeds index
+
+Revision ID: 8e3b5c0d7a24
+Revises: 4a9d2e7c1f60
+Create Date: 2025-12-21 17:05:41.227930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e3b5c0d7a24'
+down_revision: Union[str, Sequence[str], None] = '4a9d2e7c1f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_camera_feeds_active',
+            'camera_feeds',
+            ['id'],
+            unique=False,
+            postgresql_where=sa.text("status = 'active'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_camera_feeds_active', table_name='camera_feeds', postgresql_concurrently=True)
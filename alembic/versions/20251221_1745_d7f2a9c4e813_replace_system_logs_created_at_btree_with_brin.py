@@ -0,0 +1,39 @@
+"""replace system_logs created_at btree with brin
+
+Revision ID: d7f2a9c4e813
+Revises: 8e3b5c0d7a24
+Create Date: 2025-12-21 17:45:09.381617
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7f2a9c4e813'
+down_revision: Union[str, Sequence[str], None] = '8e3b5c0d7a24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_logs_created_brin',
+            'system_logs',
+            ['created_at'],
+            unique=False,
+            postgresql_using='brin',
+            postgresql_with={'pages_per_range': 32},
+            postgresql_concurrently=True,
+        )
+        op.drop_index('ix_system_logs_created_at', table_name='system_logs', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_system_logs_created_at', 'system_logs', ['created_at'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_logs_created_brin', table_name='system_logs', postgresql_concurrently=True)
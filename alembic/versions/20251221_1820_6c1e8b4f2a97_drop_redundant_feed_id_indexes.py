@@ -0,0 +1,39 @@
+"""drop redundant feed_id indexes
+
+Revision ID: 6c1e8b4f2a97
+Revises: d7f2a9c4e813
+Create Date: 2025-12-21 18:20:52.064183
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6c1e8b4f2a97'
+down_revision: Union[str, Sequence[str], None] = 'd7f2a9c4e813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Single-column indexes now covered by a (feed_id, created_at/timestamp) composite
+REDUNDANT_INDEXES = [
+    ('ix_alerts_feed_id', 'alerts'),
+    ('ix_detections_feed_id', 'detections'),
+    ('ix_system_metrics_feed_id', 'system_metrics'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table in REDUNDANT_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table in REDUNDANT_INDEXES:
+            op.create_index(name, table, ['feed_id'], unique=False, postgresql_concurrently=True)
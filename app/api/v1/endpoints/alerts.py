@@ -1,9 +1,12 @@
+from functools import partial
 from typing import Any, List, Optional
 from uuid import UUID
+from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
+from app.core.responses import row_to_dict, stream_json_array
 from app.core.dependencies import get_current_active_user, verify_agent_api_key
 from app.crud.alert import alert as alert_crud
 from app.crud.feed import feed as feed_crud
@@ -19,7 +22,33 @@ from app.schemas.alert import (
 router = APIRouter()
 
 
-@router.get("/", response_model=List[AlertResponse])
+ALERT_FIELDS = (
+    "id", "feed_id", "title", "description", "status", "severity", "alert_type",
+    "video_url", "thumbnail_url", "created_at", "updated_at",
+    "resolved_at", "resolved_by", "resolution_notes",
+)
+ANALYSIS_FIELDS = ("id", "alert_id", "confidence_score", "scene_description", "created_at")
+ACTION_FIELDS = ("id", "alert_id", "action_type", "recipient", "status", "details", "created_at")
+
+
+def _alert_to_dict(alert, include_relations: bool = True) -> dict:
+    """Without include_relations the ai_analysis/actions keys are left out"""
+    data = row_to_dict(alert, ALERT_FIELDS)
+    if not include_relations:
+        return data
+
+    analysis = alert.ai_analysis
+    data["ai_analysis"] = {
+        **row_to_dict(analysis, ANALYSIS_FIELDS),
+        "detected_objects": analysis.detected_objects or [],
+        "risk_factors": analysis.risk_factors or [],
+        "recommendations": analysis.recommendations or [],
+    } if analysis else None
+    data["actions"] = [row_to_dict(action, ACTION_FIELDS) for action in alert.actions]
+    return data
+
+
+@router.get("/", response_model=None, responses={200: {"model": List[AlertResponse]}})
 async def read_alerts(
     db: AsyncSession = Depends(get_db),
     skip: int = 0,
@@ -27,41 +56,41 @@ async def read_alerts(
     feed_id: Optional[UUID] = None,
     status: Optional[AlertStatus] = None,
     severity: Optional[AlertSeverity] = None,
+    before_ts: Optional[datetime] = None,
+    before_id: Optional[UUID] = None,
+    include_relations: bool = True,
+    with_total: bool = False,
     current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
     Retrieve alerts with filtering.
+    For keyset pagination pass the last alert's created_at/id as before_ts/before_id.
+    Pass include_relations=false for a lighter list without ai_analysis/actions.
+    Pass with_total=true to get the total match count in X-Total-Count.
     """
     # If feed_id is provided, verify ownership
-    if feed_id:
-        feed = await feed_crud.get(db, id=feed_id)
-        if not feed:
-            raise HTTPException(status_code=404, detail="Feed not found")
-        if feed.user_id != current_user.id:
-            raise HTTPException(status_code=403, detail="Not enough permissions")
+    if feed_id and not await feed_crud.user_owns(db, feed_id=feed_id, user_id=current_user.id):
+        raise HTTPException(status_code=404, detail="Feed not found")
         
-    # TODO: If no feed_id, we should filter by all feeds owned by user
-    # For now, we'll return all alerts (assuming single user or admin view for demo)
-    # In production, we must filter by user's feeds
-    
-    alerts = await alert_crud.get_multi(
-        db,
+    filters = dict(
+        user_id=current_user.id,
         skip=skip,
         limit=limit,
         feed_id=feed_id,
         status=status.value if status else None,
-        severity=severity.value if severity else None
+        severity=severity.value if severity else None,
+        before_ts=before_ts,
+        before_id=before_id,
+        include_relations=include_relations
     )
-    
-    # Filter alerts belonging to user's feeds
-    # This is inefficient, better to do in SQL join, but works for MVP
-    user_alerts = []
-    for alert in alerts:
-        feed = await feed_crud.get(db, id=alert.feed_id)
-        if feed and feed.user_id == current_user.id:
-            user_alerts.append(alert)
-            
-    return user_alerts
+    to_dict = partial(_alert_to_dict, include_relations=include_relations)
+
+    # Rows are serialized as they arrive instead of buffering the whole page
+    if with_total:
+        total, alerts = await alert_crud.stream_multi_for_user_with_total(db, **filters)
+        return stream_json_array(alerts, to_dict, headers={"X-Total-Count": str(total)})
+    alerts = alert_crud.stream_multi_for_user(db, **filters)
+    return stream_json_array(alerts, to_dict)
 
 
 @router.post("/", response_model=AlertResponse, status_code=status.HTTP_201_CREATED)
@@ -95,13 +124,13 @@ async def read_alert(
     """
     Get alert details.
     """
-    alert = await alert_crud.get(db, id=alert_id)
-    if not alert:
+    row = await alert_crud.get_with_feed(db, id=alert_id)
+    if not row:
         raise HTTPException(status_code=404, detail="Alert not found")
     
     # Verify ownership via feed
-    feed = await feed_crud.get(db, id=alert.feed_id)
-    if not feed or feed.user_id != current_user.id:
+    alert, owner_id = row
+    if owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
         
     return alert
@@ -118,13 +147,13 @@ async def resolve_alert(
     """
     Resolve an alert.
     """
-    alert = await alert_crud.get(db, id=alert_id)
-    if not alert:
+    row = await alert_crud.get_with_feed(db, id=alert_id)
+    if not row:
         raise HTTPException(status_code=404, detail="Alert not found")
     
-    # Verify ownership
-    feed = await feed_crud.get(db, id=alert.feed_id)
-    if not feed or feed.user_id != current_user.id:
+    # Verify ownership via feed
+    alert, owner_id = row
+    if owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
     alert = await alert_crud.resolve(
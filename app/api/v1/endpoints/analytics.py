@@ -1,14 +1,16 @@
-from typing import Any, List
+from functools import partial
+from typing import Any, List, Optional
 from uuid import UUID
 from datetime import datetime, timedelta, timezone
-from fastapi import APIRouter, Depends, status, Query, HTTPException
+from fastapi import APIRouter, Body, Depends, status, Query, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.dependencies import get_current_active_user
+from app.core.responses import ORJSONResponse, row_to_dict, stream_json_array
+from app.core.dependencies import get_current_active_user, get_agent_api_key
 from app.crud.analytics import analytics as analytics_crud
-from app.crud.alert import alert as alert_crud
 from app.models.user import User
 from app.schemas.analytics import (
     SystemStatusResponse,
@@ -17,7 +19,6 @@ from app.schemas.analytics import (
     PerformanceMetricsResponse,
     DetectionTrendsResponse,
     ActivityFeedResponse,
-    ActivityItem,
     TrendData,
     DetectionCreate,
     DetectionResponse,
@@ -28,6 +29,86 @@ from app.schemas.analytics import (
 
 router = APIRouter()
 
+# Dashboards poll these endpoints every few seconds; serve repeats from memory
+analytics_cache = TTLCache(ttl=settings.ANALYTICS_CACHE_TTL)
+
+
+DETECTION_FIELDS = (
+    "id", "feed_id", "alert_id", "detection_type", "confidence", "description",
+    "context_tags", "bounding_box", "frame_id", "timestamp",
+    "feedback_status", "feedback_comment",
+)
+METRIC_FIELDS = ("network_latency", "active_feeds", "active_agents", "feed_id", "id", "created_at")
+
+
+def _detection_to_dict(detection) -> dict:
+    # risk_level is not stored on the row
+    return {**row_to_dict(detection, DETECTION_FIELDS), "risk_level": None}
+
+
+_metric_to_dict = partial(row_to_dict, fields=METRIC_FIELDS)
+
+
+async def _load_system_status(db: AsyncSession, user_id: UUID) -> SystemStatusResponse:
+    # Feeds joined with their active agent session; uptime computed in SQL
+    rows = await analytics_crud.get_feeds_with_uptime(db, user_id=user_id, limit=100)
+    
+    feed_statuses = [
+        FeedSystemStatus(
+            feed_id=row.id,
+            feed_name=row.name,
+            uptime=int(row.uptime),
+            network_latency=None,
+            status=row.status,
+            sensitivity=row.sensitivity
+        )
+        for row in rows
+    ]
+    
+    return SystemStatusResponse(
+        total_active_feeds=rows[0].total_active if rows else 0,
+        feeds=feed_statuses
+    )
+
+
+async def _load_quick_stats(
+    db: AsyncSession, user_id: UUID, feed_id: Optional[UUID]
+) -> QuickStatsResponse:
+    now = datetime.now(timezone.utc)
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    this_hour_start = now.replace(minute=0, second=0, microsecond=0)
+
+    # All counters come back from a single statement
+    stats = await analytics_crud.quick_stats(
+        db,
+        user_id=user_id,
+        today_start=today_start,
+        this_hour_start=this_hour_start,
+        feed_id=feed_id
+    )
+    
+    return QuickStatsResponse(
+        events_today=stats.events_today,
+        calls_triggered=stats.calls_triggered,
+        sms_sent=stats.sms_sent,
+        detections_this_hour=stats.detections_this_hour,
+        active_alerts=stats.active_alerts
+    )
+
+
+async def _load_performance_metrics(db: AsyncSession, hours: int) -> PerformanceMetricsResponse:
+    # Get average metrics
+    avg_metrics = await analytics_crud.get_avg_metrics(db, hours=hours)
+    
+    # Get total frames and detections from active sessions (summed in SQL)
+    totals = await analytics_crud.get_active_session_totals(db)
+    
+    return PerformanceMetricsResponse(
+        avg_network_latency=avg_metrics.get("avg_network_latency"),
+        total_frames_processed=totals.total_frames,
+        total_detections=totals.total_detections
+    )
+
 
 @router.get("/system-status", response_model=SystemStatusResponse)
 async def get_system_status(
@@ -38,47 +119,9 @@ async def get_system_status(
     Get current system status for dashboard - simplified to show active feeds only.
     CPU/Memory metrics removed as agents now run on server, not cameras.
     """
-    # Get all feeds for user
-    from app.crud.feed import feed as feed_crud
-    user_feeds = await feed_crud.get_multi_by_owner(db, user_id=current_user.id, limit=100)
-    
-    # Get active sessions to calculate uptime
-    active_sessions = await analytics_crud.get_active_agent_sessions(db)
-    session_map = {session.feed_id: session for session in active_sessions}
-    
-    feed_statuses = []
-    now = datetime.now(timezone.utc)
-    
-    for feed in user_feeds:
-        uptime = 0
-        if feed.id in session_map:
-            session = session_map[feed.id]
-            if session.started_at:
-                # Ensure started_at is timezone aware
-                started_at = session.started_at
-                if started_at.tzinfo is None:
-                    started_at = started_at.replace(tzinfo=timezone.utc)
-                uptime = int((now - started_at).total_seconds())
-
-        # Get sensitivity from settings if available
-        sensitivity = "medium"
-        if feed.settings:
-            sensitivity = feed.settings.sensitivity
-
-        feed_statuses.append(
-            FeedSystemStatus(
-                feed_id=feed.id,
-                feed_name=feed.name,
-                uptime=uptime,
-                network_latency=None,
-                status=feed.status,
-                sensitivity=sensitivity
-            )
-        )
-    
-    return SystemStatusResponse(
-        total_active_feeds=len([f for f in user_feeds if f.status == 'active']),
-        feeds=feed_statuses
+    return await analytics_cache.get_or_set(
+        ("system-status", current_user.id),
+        lambda: _load_system_status(db, current_user.id)
     )
 
 
@@ -91,28 +134,9 @@ async def get_quick_stats(
     """
     Get quick stats for today.
     """
-    today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-    this_hour_start = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
-
-    # Count calls and SMS from AlertActions
-    calls_triggered = await analytics_crud.count_actions_today(db, action_type="call", feed_id=feed_id)
-    sms_sent = await analytics_crud.count_actions_today(db, action_type="sms", feed_id=feed_id)
-    
-    # Count detections this hour
-    detections_this_hour = await analytics_crud.count_detections_since(db, since=this_hour_start, feed_id=feed_id)
-    
-    # Count active alerts
-    active_alerts = await analytics_crud.count_active_alerts(db, feed_id=feed_id)
-    
-    # Count events today (alerts + detections)
-    events_today = await analytics_crud.count_detections_since(db, since=today_start, feed_id=feed_id)
-    
-    return QuickStatsResponse(
-        events_today=events_today,
-        calls_triggered=calls_triggered,
-        sms_sent=sms_sent,
-        detections_this_hour=detections_this_hour,
-        active_alerts=active_alerts
+    return await analytics_cache.get_or_set(
+        ("quick-stats", current_user.id, feed_id),
+        lambda: _load_quick_stats(db, current_user.id, feed_id)
     )
 
 
@@ -125,18 +149,10 @@ async def get_performance_metrics(
     """
     Get system performance metrics.
     """
-    # Get average metrics
-    avg_metrics = await analytics_crud.get_avg_metrics(db, hours=hours)
-    
-    # Get total frames and detections from active sessions
-    active_sessions = await analytics_crud.get_active_agent_sessions(db)
-    total_frames = sum(session.frames_processed for session in active_sessions)
-    total_detections = sum(session.detections_count for session in active_sessions)
-    
-    return PerformanceMetricsResponse(
-        avg_network_latency=avg_metrics.get("avg_network_latency"),
-        total_frames_processed=total_frames,
-        total_detections=total_detections
+    # Metrics are not user-specific, so all users share one entry per window
+    return await analytics_cache.get_or_set(
+        ("performance", hours),
+        lambda: _load_performance_metrics(db, hours)
     )
 
 
@@ -148,39 +164,18 @@ async def get_detection_trends(
     current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
-    Get detection confidence values over time for real-time line chart.
-    Returns individual detection points with timestamp and confidence value.
+    Get detection confidence over time for the line chart.
+    Returns one point per hour with the average confidence in that hour.
     """
-    from app.models.analytics import Detection
-    
     since = datetime.now(timezone.utc) - timedelta(hours=hours)
     
     # Get detection types count
     detection_types = await analytics_crud.get_detection_types_count(db, since=since)
     
-    # Get individual detections with timestamp and confidence
-    query = (
-        select(
-            Detection.timestamp,
-            Detection.confidence,
-            Detection.detection_type
-        )
-        .where(Detection.timestamp >= since)
-        .order_by(Detection.timestamp)
-    )
-    
-    if feed_id:
-        query = query.where(Detection.feed_id == feed_id)
-    
-    # Limit to last 500 points for performance
-    query = query.limit(500)
-    
-    result = await db.execute(query)
-    rows = result.all()
-    
-    # Return detection confidence points
+    # Hourly buckets are aggregated in SQL: at most `hours` rows come back
+    rows = await analytics_crud.get_hourly_detection_trends(db, since=since, feed_id=feed_id)
     hourly_detections = [
-        TrendData(timestamp=row.timestamp, value=float(row.confidence))
+        TrendData(timestamp=row.bucket, value=row.avg_confidence)
         for row in rows
     ]
     
@@ -190,68 +185,48 @@ async def get_detection_trends(
     )
 
 
-@router.get("/activity-feed", response_model=ActivityFeedResponse)
+@router.get("/activity-feed", response_model=None, responses={200: {"model": ActivityFeedResponse}})
 async def get_activity_feed(
     db: AsyncSession = Depends(get_db),
     limit: int = Query(20, le=100),
+    before_ts: Optional[datetime] = None,
+    before_id: Optional[UUID] = None,
     current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
     Get live activity feed.
+    For older pages pass the last item's timestamp/id as before_ts/before_id.
     """
-    # Get recent alerts
-    recent_alerts = await alert_crud.get_multi(db, skip=0, limit=limit // 2)
-    
-    # Get recent detections
-    recent_detections = await analytics_crud.get_recent_detections(db, skip=0, limit=limit // 2)
-    
-    activities = []
-    
-    # Convert alerts to activities
-    for alert in recent_alerts:
-        activities.append(ActivityItem(
-            id=alert.id,
-            type="alert",
-            title=alert.title,
-            description=alert.description or "",
-            timestamp=alert.created_at,
-            severity=alert.severity,
-            feed_id=alert.feed_id
-        ))
-    
-    # Convert detections to activities
-    for detection in recent_detections:
-        activities.append(ActivityItem(
-            id=detection.id,
-            type="detection",
-            title=f"{detection.detection_type.capitalize()} detected",
-            description=f"Confidence: {detection.confidence:.2%}",
-            timestamp=detection.timestamp,
-            feed_id=detection.feed_id
-        ))
-    
-    # Sort by timestamp descending
-    activities.sort(key=lambda x: x.timestamp, reverse=True)
-    
-    return ActivityFeedResponse(activities=activities[:limit])
+    # Alerts and detections merged, ordered and limited in SQL
+    rows = await analytics_crud.get_activity_feed(
+        db, limit=limit, before_ts=before_ts, before_id=before_id
+    )
+    # Rows already have the ActivityItem shape; skip per-row validation
+    return ORJSONResponse({"activities": [dict(row._mapping) for row in rows]})
 
 
 # Detections endpoints
-@router.get("/detections", response_model=List[DetectionResponse], tags=["Detections"])
+@router.get(
+    "/detections",
+    response_model=None,
+    responses={200: {"model": List[DetectionResponse]}},
+    tags=["Detections"]
+)
 async def read_detections(
     db: AsyncSession = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
     feed_id: UUID = None,
+    context_tag: Optional[str] = None,
     current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
-    Retrieve recent detections.
+    Retrieve recent detections, optionally only those carrying a context tag.
     """
-    detections = await analytics_crud.get_recent_detections(
-        db, skip=skip, limit=limit, feed_id=feed_id
+    detections = analytics_crud.stream_recent_detections(
+        db, skip=skip, limit=limit, feed_id=feed_id, context_tag=context_tag
     )
-    return detections
+    return stream_json_array(detections, _detection_to_dict)
 
 
 @router.post("/detections", response_model=DetectionResponse, status_code=status.HTTP_201_CREATED, tags=["Detections"])
@@ -265,9 +240,36 @@ async def create_detection(
     Create new detection (Agent endpoint).
     """
     detection = await analytics_crud.create_detection(db, obj_in=detection_in)
+    analytics_cache.invalidate()
     return detection
 
 
+@router.post(
+    "/detections/bulk",
+    response_model=None,
+    status_code=status.HTTP_201_CREATED,
+    responses={201: {"model": List[DetectionResponse]}},
+    tags=["Detections"]
+)
+async def create_detections_bulk(
+    *,
+    db: AsyncSession = Depends(get_db),
+    detections_in: List[DetectionCreate] = Body(..., max_length=1000),
+    api_key: str = Depends(get_agent_api_key),
+) -> Any:
+    """
+    Create a batch of detections in one request (Agent endpoint).
+    Requires X-API-Key.
+    Agents should prefer this over one POST per frame.
+    """
+    detections = await analytics_crud.create_detections_bulk(db, objs_in=detections_in)
+    analytics_cache.invalidate()
+    return ORJSONResponse(
+        [_detection_to_dict(detection) for detection in detections],
+        status_code=status.HTTP_201_CREATED
+    )
+
+
 # System metrics endpoint (for agent to report metrics)
 @router.post("/metrics", response_model=SystemMetricResponse)
 async def create_metric(
@@ -280,9 +282,35 @@ async def create_metric(
     Create new system metric (Agent endpoint).
     """
     metric = await analytics_crud.create_metric(db, obj_in=metric_in)
+    analytics_cache.invalidate()
     return metric
 
 
+@router.post(
+    "/metrics/bulk",
+    response_model=None,
+    status_code=status.HTTP_201_CREATED,
+    responses={201: {"model": List[SystemMetricResponse]}},
+    tags=["Metrics"]
+)
+async def create_metrics_bulk(
+    *,
+    db: AsyncSession = Depends(get_db),
+    metrics_in: List[SystemMetricCreate] = Body(..., max_length=1000),
+    api_key: str = Depends(get_agent_api_key),
+) -> Any:
+    """
+    Create a batch of system metrics in one request (Agent endpoint).
+    Requires X-API-Key.
+    """
+    metrics = await analytics_crud.create_metrics_bulk(db, objs_in=metrics_in)
+    analytics_cache.invalidate()
+    return ORJSONResponse(
+        [_metric_to_dict(metric) for metric in metrics],
+        status_code=status.HTTP_201_CREATED
+    )
+
+
 @router.post("/detections/{detection_id}/feedback", response_model=DetectionResponse)
 async def submit_detection_feedback(
     *,
@@ -1,7 +1,6 @@
 from datetime import timedelta
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core import security
@@ -23,6 +22,10 @@ from app.schemas.user import (
 
 router = APIRouter()
 
+# Verified against when the email is unknown so login takes the same time
+# whether or not the account exists
+DUMMY_PASSWORD_HASH = security.get_password_hash("xmonitor-dummy-password")
+
 
 @router.post("/register", response_model=RegisterResponse, status_code=status.HTTP_201_CREATED)
 async def register(
@@ -77,11 +80,19 @@ async def login(
     """
     # Authenticate user
     user = await user_crud.get_by_email(db, email=user_in.email)
-    if not user or not security.verify_password(user_in.password, user.password_hash):
+    password_hash = user.password_hash if user else DUMMY_PASSWORD_HASH
+    password_ok, new_hash = await security.verify_and_update_password_async(
+        user_in.password, password_hash
+    )
+    if not user or not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
         )
+
+    # Move hashes made with older argon2 parameters onto the current ones
+    if new_hash:
+        user = await user_crud.update(db, db_obj=user, obj_in={"password_hash": new_hash})
     
     if not user.is_active:
         raise HTTPException(
@@ -120,7 +131,7 @@ async def refresh_token(
     Refresh access token using refresh token
     """
     # Verify refresh token
-    payload = security.verify_token(token_in.refresh_token, token_type="refresh")
+    payload = await security.verify_token_async(token_in.refresh_token, token_type="refresh")
     if not payload:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -4,9 +4,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_active_user
+from app.core.dependencies import get_current_active_user, get_feed_ownership_loader
 from app.crud.contact import contact as contact_crud
-from app.crud.feed import feed as feed_crud
+from app.crud.feed import FeedOwnershipLoader
 from app.models.user import User
 from app.schemas.contact import AlertContactCreate, AlertContactResponse
 
@@ -20,17 +20,14 @@ async def read_feed_contacts(
     feed_id: UUID,
     skip: int = 0,
     limit: int = 100,
-    current_user: User = Depends(get_current_active_user),
+    feed_owner: FeedOwnershipLoader = Depends(get_feed_ownership_loader),
 ) -> Any:
     """
     Retrieve all contacts for a specific feed.
     """
     # Verify feed ownership
-    feed = await feed_crud.get(db, id=feed_id)
-    if not feed:
+    if not await feed_owner.load(feed_id):
         raise HTTPException(status_code=404, detail="Feed not found")
-    if feed.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
     
     contacts = await contact_crud.get_multi_by_feed(
         db, feed_id=feed_id, skip=skip, limit=limit
@@ -44,17 +41,14 @@ async def create_feed_contact(
     db: AsyncSession = Depends(get_db),
     feed_id: UUID,
     contact_in: AlertContactCreate,
-    current_user: User = Depends(get_current_active_user),
+    feed_owner: FeedOwnershipLoader = Depends(get_feed_ownership_loader),
 ) -> Any:
     """
     Add new contact to a feed.
     """
     # Verify feed ownership
-    feed = await feed_crud.get(db, id=feed_id)
-    if not feed:
+    if not await feed_owner.load(feed_id):
         raise HTTPException(status_code=404, detail="Feed not found")
-    if feed.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
     
     contact = await contact_crud.create_with_feed(
         db, obj_in=contact_in, feed_id=feed_id
@@ -73,19 +67,10 @@ async def delete_feed_contact(
     """
     Remove contact from a feed.
     """
-    # Verify feed ownership
-    feed = await feed_crud.get(db, id=feed_id)
-    if not feed:
-        raise HTTPException(status_code=404, detail="Feed not found")
-    if feed.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-    
-    # Verify contact exists and belongs to feed
-    contact = await contact_crud.get(db, id=contact_id)
+    # Feed ownership and contact membership are checked by the DELETE itself
+    contact = await contact_crud.remove_scoped(
+        db, contact_id=contact_id, feed_id=feed_id, user_id=current_user.id
+    )
     if not contact:
         raise HTTPException(status_code=404, detail="Contact not found")
-    if contact.feed_id != feed_id:
-        raise HTTPException(status_code=400, detail="Contact does not belong to this feed")
-    
-    contact = await contact_crud.remove(db, id=contact_id)
     return contact
@@ -4,9 +4,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
-from app.core.database import get_db
+from app.core.responses import ORJSONResponse, row_to_dict
 from app.core.dependencies import get_current_active_user, get_agent_api_key
-from app.crud.feed import feed as feed_crud
+from app.crud.feed import feed as feed_crud, FEED_RESPONSE_COLUMNS, CONTACT_RESPONSE_COLUMNS
 from app.models.user import User
 from app.models.feed import FeedStatus
 from app.schemas.feed import (
@@ -16,27 +16,40 @@ from app.schemas.feed import (
     FeedSettingsUpdate,
     FeedSettingsResponse
 )
+from app.worker.tasks import monitor_feed_task
 
 router = APIRouter()
 
+FEED_FIELDS = tuple(column.key for column in FEED_RESPONSE_COLUMNS)
+CONTACT_FIELDS = tuple(column.key for column in CONTACT_RESPONSE_COLUMNS)
+
+
+def _feed_to_dict(feed) -> dict:
+    data = row_to_dict(feed, FEED_FIELDS)
+    data["contacts"] = [row_to_dict(contact, CONTACT_FIELDS) for contact in feed.contacts]
+    return data
 
-@router.get("/", response_model=List[FeedResponse])
+
+@router.get("/", response_model=None, responses={200: {"model": List[FeedResponse]}})
 async def read_feeds(
     db: AsyncSession = Depends(get_db),
     skip: int = 0,
     limit: int = 100,
+    after_id: UUID = None,
     current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
     Retrieve all feeds for current user.
+    For the next page pass the last feed's id as after_id instead of skip.
     """
     feeds = await feed_crud.get_multi_by_owner(
-        db, user_id=current_user.id, skip=skip, limit=limit
+        db, user_id=current_user.id, skip=skip, limit=limit, after_id=after_id
     )
-    return feeds
+    # Rows are trusted; skip per-row validation of each feed and its contacts
+    return ORJSONResponse([_feed_to_dict(feed) for feed in feeds])
 
 
-@router.get("/active", response_model=List[FeedResponse])
+@router.get("/active", response_model=None, responses={200: {"model": List[FeedResponse]}})
 async def read_active_feeds(
     db: AsyncSession = Depends(get_db),
     api_key: str = Depends(get_agent_api_key),
@@ -45,8 +58,9 @@ async def read_active_feeds(
     Get all active feeds (Agent endpoint).
     Requires X-API-Key.
     """
+    # Rows are already in the FeedResponse shape; skip per-row validation
     feeds = await feed_crud.get_all_active(db)
-    return feeds
+    return ORJSONResponse(feeds)
 
 
 @router.post("/", response_model=FeedResponse, status_code=status.HTTP_201_CREATED)
@@ -75,11 +89,9 @@ async def read_feed(
     """
     Get feed details by ID.
     """
-    feed = await feed_crud.get(db, id=feed_id)
+    feed = await feed_crud.get_owned(db, id=feed_id, user_id=current_user.id)
     if not feed:
         raise HTTPException(status_code=404, detail="Feed not found")
-    if feed.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
     return feed
 
 
@@ -94,11 +106,9 @@ async def update_feed(
     """
     Update feed details.
     """
-    feed = await feed_crud.get(db, id=feed_id)
+    feed = await feed_crud.get_owned(db, id=feed_id, user_id=current_user.id)
     if not feed:
         raise HTTPException(status_code=404, detail="Feed not found")
-    if feed.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
     
     feed = await feed_crud.update(db, db_obj=feed, obj_in=feed_in)
     return feed
@@ -114,13 +124,11 @@ async def delete_feed(
     """
     Delete feed.
     """
-    feed = await feed_crud.get(db, id=feed_id)
+    feed = await feed_crud.get_owned(db, id=feed_id, user_id=current_user.id)
     if not feed:
         raise HTTPException(status_code=404, detail="Feed not found")
-    if feed.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    feed = await feed_crud.remove(db, id=feed_id)
+    feed = await feed_crud.remove(db, db_obj=feed)
     return feed
 
 
@@ -134,26 +142,13 @@ async def toggle_feed_status(
     """
     Toggle feed status (active/inactive).
     """
-    feed = await feed_crud.get(db, id=feed_id)
+    # Status flip happens in a single UPDATE, so concurrent toggles cannot race
+    feed = await feed_crud.toggle_owned(db, id=feed_id, user_id=current_user.id)
     if not feed:
         raise HTTPException(status_code=404, detail="Feed not found")
-    if feed.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-    
-    new_status = FeedStatus.ACTIVE if feed.status == FeedStatus.INACTIVE.value else FeedStatus.INACTIVE
-    
-    update_data = {"status": new_status}
-    if new_status == FeedStatus.ACTIVE:
-        from datetime import datetime
-        update_data["start_time"] = datetime.now()
-    else:
-        update_data["start_time"] = None
-        
-    feed = await feed_crud.update(db, db_obj=feed, obj_in=update_data)
     
     # Trigger Background Worker if ACTIVE
-    if new_status == FeedStatus.ACTIVE:
-        from app.worker.tasks import monitor_feed_task
+    if feed.status == FeedStatus.ACTIVE.value:
         monitor_feed_task.delay(str(feed.id))
 
     return feed
@@ -169,12 +164,10 @@ async def read_feed_settings(
     """
     Get feed settings.
     """
-    feed = await feed_crud.get(db, id=feed_id)
-    if not feed:
+    settings = await feed_crud.get_owned_settings(db, feed_id=feed_id, user_id=current_user.id)
+    if not settings:
         raise HTTPException(status_code=404, detail="Feed not found")
-    if feed.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
-    return feed.settings
+    return settings
 
 
 @router.patch("/{feed_id}/settings", response_model=FeedSettingsResponse)
@@ -188,11 +181,8 @@ async def update_feed_settings(
     """
     Update feed settings.
     """
-    feed = await feed_crud.get(db, id=feed_id)
-    if not feed:
+    if not await feed_crud.user_owns(db, feed_id=feed_id, user_id=current_user.id):
         raise HTTPException(status_code=404, detail="Feed not found")
-    if feed.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not enough permissions")
     
     settings = await feed_crud.update_settings(db, feed_id=feed_id, obj_in=settings_in)
     return settings
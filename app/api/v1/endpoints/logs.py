@@ -1,13 +1,16 @@
-from typing import Any, List
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from fastapi.responses import StreamingResponse
+from functools import partial
+from typing import Any, List, Optional
+from datetime import datetime
+from uuid import UUID
+from fastapi import APIRouter, Body, Depends, HTTPException, status, Query
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 import csv
-import json
 from io import StringIO
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_active_user
+from app.core.responses import ORJSONResponse, row_to_dict, stream_json_array
+from app.core.dependencies import get_current_active_user, get_agent_api_key
 from app.crud.log import log as log_crud
 from app.models.user import User
 from app.schemas.log import (
@@ -21,7 +24,15 @@ from app.schemas.log import (
 router = APIRouter()
 
 
-@router.get("/", response_model=List[SystemLogResponse])
+# SystemLogResponse fields; rows come from EXPORT_COLUMNS, extra columns are dropped
+LOG_RESPONSE_FIELDS = (
+    "id", "source", "level", "message", "details",
+    "feed_id", "user_id", "alert_id", "created_at",
+)
+_log_to_dict = partial(row_to_dict, fields=LOG_RESPONSE_FIELDS)
+
+
+@router.get("/", response_model=None, responses={200: {"model": List[SystemLogResponse]}})
 async def read_logs(
     db: AsyncSession = Depends(get_db),
     skip: int = 0,
@@ -29,10 +40,15 @@ async def read_logs(
     source: LogSource = None,
     level: LogLevel = None,
     search: str = None,
+    before_ts: Optional[datetime] = None,
+    before_id: Optional[UUID] = None,
+    with_total: bool = False,
     current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """
     Retrieve system logs with filtering.
+    For older pages pass the last log's created_at/id as `before_ts`/`before_id`
+    instead of skip. Pass with_total=true to get the match count in X-Total-Count.
     """
     filters = SystemLogFilter(
         source=source,
@@ -40,13 +56,19 @@ async def read_logs(
         search=search
     )
     
-    logs = await log_crud.get_multi(
-        db,
-        skip=skip,
-        limit=limit,
-        filters=filters
-    )
-    return logs
+    page = dict(skip=skip, limit=limit, filters=filters, before_ts=before_ts, before_id=before_id)
+
+    if with_total:
+        # Page and total from a single query
+        logs, total = await log_crud.list_and_count(db, **page)
+        return ORJSONResponse(
+            [_log_to_dict(log) for log in logs],
+            headers={"X-Total-Count": str(total)}
+        )
+
+    # Up to 1000 rows; serialize them as they arrive instead of buffering the page
+    logs = log_crud.stream_multi(db, **page)
+    return stream_json_array(logs, _log_to_dict)
 
 
 @router.post("/", response_model=SystemLogResponse, status_code=status.HTTP_201_CREATED)
@@ -63,6 +85,21 @@ async def create_log(
     return log_entry
 
 
+@router.post("/bulk", status_code=status.HTTP_204_NO_CONTENT, response_class=Response)
+async def create_logs_bulk(
+    *,
+    db: AsyncSession = Depends(get_db),
+    logs_in: List[SystemLogCreate] = Body(..., max_length=1000),
+    api_key: str = Depends(get_agent_api_key),
+) -> Response:
+    """
+    Create a batch of log entries in one request (Agent endpoint).
+    Requires X-API-Key.
+    """
+    await log_crud.create_many(db, objs_in=logs_in)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
 @router.post("/export")
 async def export_logs(
     *,
@@ -82,60 +119,55 @@ async def export_logs(
         search=search
     )
     
-    # Get all matching logs (no pagination for export)
-    logs = await log_crud.get_multi(
+    # Rows are pulled from the DB in batches and written out as they arrive
+    batches = log_crud.stream_export_rows(
         db,
-        skip=0,
         limit=10000,  # Max export limit
         filters=filters
     )
     
     if format == "json":
-        # Export as JSON
-        logs_data = [
-            {
-                "id": str(log.id),
-                "source": log.source,
-                "level": log.level,
-                "message": log.message,
-                "details": log.details,
-                "feed_id": str(log.feed_id) if log.feed_id else None,
-                "user_id": str(log.user_id) if log.user_id else None,
-                "alert_id": str(log.alert_id) if log.alert_id else None,
-                "created_at": log.created_at.isoformat()
-            }
-            for log in logs
-        ]
-        
-        return StreamingResponse(
-            iter([json.dumps(logs_data, indent=2)]),
-            media_type="application/json",
+        # Same encoding as the log list, one row at a time
+        async def rows():
+            async for batch in batches:
+                for row in batch:
+                    yield row
+
+        return stream_json_array(
+            rows(),
+            _log_to_dict,
             headers={"Content-Disposition": "attachment; filename=logs.json"}
         )
     
     else:  # CSV format
-        output = StringIO()
-        writer = csv.DictWriter(
-            output,
-            fieldnames=["id", "source", "level", "message", "details", "feed_id", "user_id", "alert_id", "created_at"]
-        )
-        writer.writeheader()
-        
-        for log in logs:
-            writer.writerow({
-                "id": str(log.id),
-                "source": log.source,
-                "level": log.level,
-                "message": log.message,
-                "details": log.details or "",
-                "feed_id": str(log.feed_id) if log.feed_id else "",
-                "user_id": str(log.user_id) if log.user_id else "",
-                "alert_id": str(log.alert_id) if log.alert_id else "",
-                "created_at": log.created_at.isoformat()
-            })
+        async def generate_csv():
+            output = StringIO()
+            writer = csv.DictWriter(
+                output,
+                fieldnames=["id", "source", "level", "message", "details", "feed_id", "user_id", "alert_id", "created_at"]
+            )
+            writer.writeheader()
+            yield output.getvalue()
+            
+            async for rows in batches:
+                output.seek(0)
+                output.truncate()
+                for log in rows:
+                    writer.writerow({
+                        "id": str(log.id),
+                        "source": log.source,
+                        "level": log.level,
+                        "message": log.message,
+                        "details": log.details or "",
+                        "feed_id": str(log.feed_id) if log.feed_id else "",
+                        "user_id": str(log.user_id) if log.user_id else "",
+                        "alert_id": str(log.alert_id) if log.alert_id else "",
+                        "created_at": log.created_at.isoformat()
+                    })
+                yield output.getvalue()
         
         return StreamingResponse(
-            iter([output.getvalue()]),
+            generate_csv(),
             media_type="text/csv",
             headers={"Content-Disposition": "attachment; filename=logs.csv"}
         )
@@ -1,15 +1,27 @@
+import mimetypes
+import os
+import re
 from typing import Any
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.dependencies import get_current_active_user
 from app.models.user import User
-from app.services.media import media_service
+from app.services.media import media_service, UploadTooLargeError
 
 router = APIRouter()
 
+# Allowed upload extensions per media type
+VIDEO_EXTENSIONS = frozenset({".mp4", ".avi", ".mov", ".mkv", ".webm"})
+IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".gif", ".webp"})
+ALLOWED_EXTENSIONS = {"video": VIDEO_EXTENSIONS, "image": IMAGE_EXTENSIONS}
+
+# Relative media paths only: no leading slash, no ".." segments, plain characters
+SAFE_MEDIA_PATH = re.compile(r"^(?!/)(?!.*\.\.)[A-Za-z0-9_./-]+$")
+
 
 @router.post("/upload")
 async def upload_media(
@@ -22,32 +34,22 @@ async def upload_media(
     """
     Upload media file (video or snapshot).
     """
-    # Validate file size
-    from app.core.config import settings
-    
+    # Oversized bodies are rejected by BodySizeLimitMiddleware before parsing;
+    # save_media enforces MAX_UPLOAD_SIZE again on the parsed file
     # Validate media type
-    if media_type not in ["video", "image"]:
+    allowed_extensions = ALLOWED_EXTENSIONS.get(media_type)
+    if not allowed_extensions:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="media_type must be 'video' or 'image'"
         )
     
     # Validate file extension
-    allowed_video_extensions = {".mp4", ".avi", ".mov", ".mkv", ".webm"}
-    allowed_image_extensions = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
-    
-    file_extension = file.filename.split(".")[-1].lower() if file.filename else ""
-    
-    if media_type == "video" and f".{file_extension}" not in allowed_video_extensions:
+    file_extension = os.path.splitext(file.filename or "")[1].lower()
+    if file_extension not in allowed_extensions:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid video file type. Allowed: {', '.join(allowed_video_extensions)}"
-        )
-    
-    if media_type == "image" and f".{file_extension}" not in allowed_image_extensions:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid image file type. Allowed: {', '.join(allowed_image_extensions)}"
+            detail=f"Invalid {media_type} file type. Allowed: {', '.join(sorted(allowed_extensions))}"
         )
     
     try:
@@ -57,6 +59,11 @@ async def upload_media(
             "url": result["url"],
             "storage": result["storage"]
         }
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -70,6 +77,13 @@ async def get_media(file_path: str):
     Retrieve media file from local storage.
     Note: Cloudinary files are served directly from Cloudinary URLs.
     """
+    # Reject traversal attempts before touching the filesystem
+    if not SAFE_MEDIA_PATH.match(file_path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Media file not found"
+        )
+    
     # Construct URL format
     file_url = f"/media/{file_path}"
     
@@ -81,4 +95,19 @@ async def get_media(file_path: str):
             detail="Media file not found"
         )
     
-    return FileResponse(local_file_path)
+    cache_control = f"public, max-age={settings.MEDIA_CACHE_MAX_AGE}, stale-while-revalidate=60"
+    
+    if settings.MEDIA_XACCEL:
+        # nginx sends the bytes itself; the worker is free as soon as this returns
+        relative_path = local_file_path.relative_to(media_service.upload_dir).as_posix()
+        return Response(
+            status_code=status.HTTP_200_OK,
+            headers={
+                "X-Accel-Redirect": f"{settings.MEDIA_XACCEL_PREFIX}/{relative_path}",
+                "Content-Type": mimetypes.guess_type(local_file_path.name)[0] or "application/octet-stream",
+                "Cache-Control": cache_control
+            }
+        )
+    
+    # FileResponse derives a strong ETag from mtime + size; ETagMiddleware answers 304s
+    return FileResponse(local_file_path, headers={"Cache-Control": cache_control})
@@ -1,8 +1,27 @@
+import logging
+import math
+import orjson
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, Query
 from app.services.websocket import manager
-from app.core.security import verify_token
+from app.core.security import verify_token_cached
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
+# Heartbeats are the most frequent message; answer them from a template
+_PONG_TEMPLATE = '{{"type":"pong","data":{{"timestamp":{}}}}}'
+_PONG_NO_TIMESTAMP = '{"type":"pong","data":{"timestamp":null}}'
+
+
+def _pong(timestamp) -> str:
+    """Pong frame echoing the client's timestamp"""
+    if timestamp is None:
+        return _PONG_NO_TIMESTAMP
+    if type(timestamp) is int or (type(timestamp) is float and math.isfinite(timestamp)):
+        return _PONG_TEMPLATE.format(timestamp)
+    # Anything else (e.g. ISO strings) still needs proper JSON escaping
+    return _PONG_TEMPLATE.format(orjson.dumps(timestamp).decode())
+
 router = APIRouter()
 
 
@@ -21,8 +40,8 @@ async def websocket_monitoring(
     - alert:new - New alert created
     - alert:resolved - Alert resolved
     """
-    # Verify JWT token
-    payload = verify_token(token, token_type="access")
+    # Verify JWT token (cached across reconnects with the same token)
+    payload = verify_token_cached(token, token_type="access")
     if not payload:
         await websocket.close(code=1008)  # Policy violation
         return
@@ -32,8 +51,12 @@ async def websocket_monitoring(
         await websocket.close(code=1008)
         return
     
-    # Connect WebSocket
-    await manager.connect(websocket, user_id)
+    # Connect WebSocket; refuse with "try again later" when the server is full.
+    # A close before accept() becomes an HTTP 403, so accept first to let 1013 through
+    if not await manager.connect(websocket, user_id):
+        await websocket.accept()
+        await websocket.close(code=1013)
+        return
     
     try:
         # Send initial connection success message
@@ -52,10 +75,7 @@ async def websocket_monitoring(
             
             if message_type == "ping":
                 # Respond to heartbeat
-                await websocket.send_json({
-                    "type": "pong",
-                    "data": {"timestamp": data.get("timestamp")}
-                })
+                await websocket.send_text(_pong(data.get("timestamp")))
             
             elif message_type == "subscribe":
                 # Handle subscription requests (future feature)
@@ -67,9 +87,18 @@ async def websocket_monitoring(
     
     except WebSocketDisconnect:
         manager.disconnect(websocket, user_id)
-    except Exception as e:
-        print(f"WebSocket error: {e}")
+    except ValueError as e:
+        # Client sent a frame that is not valid JSON
+        logger.warning(
+            "Closing WebSocket for user %s after invalid message: %s", user_id, e,
+            exc_info=logger.isEnabledFor(logging.DEBUG)
+        )
+        manager.disconnect(websocket, user_id)
+    except Exception:
+        logger.exception("Unexpected WebSocket error for user %s", user_id)
         manager.disconnect(websocket, user_id)
+    finally:
+        await manager.release()
 
 
 # Helper functions for sending events (can be called from other endpoints)
@@ -0,0 +1,88 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Small in-process cache for short-lived endpoint results.
+
+    Entries expire after `ttl` seconds. Concurrent misses on the same key are
+    coalesced behind a per-key lock so only one caller hits the database
+    (single-flight). `invalidate()` bumps a version and `pop()` bumps a per-key
+    generation, so results computed before a write are never stored after it.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.version = 0
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        # Only kept for keys with a lock, i.e. a load that may be in flight
+        self._generations: Dict[Hashable, int] = {}
+
+    def _get_fresh(self, key: Hashable) -> Tuple[bool, Any]:
+        entry = self._data.get(key)
+        if entry and entry[0] > time.monotonic():
+            return True, entry[1]
+        return False, None
+
+    def _evict(self) -> None:
+        """Drop expired entries, then the oldest ones if still over maxsize"""
+        now = time.monotonic()
+        for key in [k for k, (expires, _) in self._data.items() if expires <= now]:
+            del self._data[key]
+        while len(self._data) >= self.maxsize:
+            del self._data[next(iter(self._data))]
+        for key in [k for k, lock in self._locks.items() if k not in self._data and not lock.locked()]:
+            del self._locks[key]
+            self._generations.pop(key, None)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing or expired"""
+        hit, value = self._get_fresh(key)
+        return value if hit else default
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value; ttl may shorten (never extend) the cache-wide TTL"""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        if len(self._data) >= self.maxsize:
+            self._evict()
+        self._data[key] = (time.monotonic() + ttl, value)
+
+    def pop(self, key: Hashable) -> None:
+        """Drop a single entry, e.g. after the underlying row changed"""
+        self._data.pop(key, None)
+        if key in self._locks:
+            # A load started before this write must not store its result
+            self._generations[key] = self._generations.get(key, 0) + 1
+
+    async def get_or_set(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for key, computing it with factory on a miss"""
+        hit, value = self._get_fresh(key)
+        if hit:
+            return value
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another waiter may have filled the entry while we were queued
+            hit, value = self._get_fresh(key)
+            if hit:
+                return value
+
+            version = self.version
+            generation = self._generations.get(key, 0)
+            value = await factory()
+            if version == self.version and generation == self._generations.get(key, 0):
+                if len(self._data) >= self.maxsize:
+                    self._evict()
+                self._data[key] = (time.monotonic() + self.ttl, value)
+            return value
+
+    def invalidate(self) -> None:
+        """Drop all cached entries"""
+        self.version += 1
+        self._data.clear()
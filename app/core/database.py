@@ -1,45 +1,69 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from functools import lru_cache
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
-from typing import AsyncGenerator
-from app.core.config import settings
-
-# Create async PostgreSQL engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,  # Log SQL queries in debug mode
-    future=True,
-    pool_pre_ping=True,  # Verify connections before using
-    pool_size=10,  # Connection pool size
-    max_overflow=20,  # Max connections beyond pool_size
-)
-
-# Create async session factory
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
-)
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from app.core.config import get_settings
+
+@lru_cache(maxsize=1)
+def get_engine() -> AsyncEngine:
+    """
+    Create the async PostgreSQL engine on first use.
+    Importing this module (e.g. for Base in models and Alembic) stays cheap,
+    and nothing touches DB settings until a connection is actually needed.
+    """
+    settings = get_settings()
+    return create_async_engine(
+        settings.DATABASE_URL,
+        echo=settings.DB_ECHO,  # Log SQL queries (kept separate from DEBUG; it is expensive)
+        future=True,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,  # Stale connections are handled by pool_recycle instead
+        pool_size=settings.DB_POOL_SIZE,  # Connections kept open between requests
+        max_overflow=settings.DB_MAX_OVERFLOW,  # Max connections beyond pool_size
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,  # Replace connections before server-side idle timeouts
+        connect_args={
+            # Reuse server-side prepared plans for the hot by-id lookups
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            # Short OLTP queries never benefit from JIT compilation
+            "server_settings": {"jit": "off"},
+        },
+    )
+
+
+@lru_cache(maxsize=1)
+def get_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    """Async session factory bound to the lazily created engine"""
+    return async_sessionmaker(
+        get_engine(),
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    """Open a new session; kept as a callable so existing call sites work unchanged"""
+    return get_sessionmaker()()
+
 
 # Base class for ORM models
 Base = declarative_base()
 
 
 # Dependency to get async database session
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
+async def get_db(request: Request) -> AsyncSession:
     """
     Async database session dependency.
-    Yields an async database session and ensures it's closed after use.
+    Returns the session DBSessionMiddleware opened for this request, so every
+    dependency and the route handler share one session (and at most one
+    pooled connection) per request.
     """
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        except Exception:
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
+    return request.state.db
 
 
 # Function to initialize database
@@ -49,7 +73,10 @@ async def init_db():
     Call this at application startup.
     Note: In production, use Alembic migrations instead.
     """
-    async with engine.begin() as conn:
+    async with get_engine().begin() as conn:
+        # Fail fast at startup if the pool cannot reach the database
+        await conn.execute(text("SELECT 1"))
+
         # Import all models to register them
         from app.models import user  # noqa: F401
         
@@ -60,3 +87,7 @@ async def init_db():
         #     print("✅ Database tables created successfully!")
 
 
+async def close_db():
+    """Close all pooled connections; call this at application shutdown"""
+    if get_engine.cache_info().currsize:
+        await get_engine().dispose()
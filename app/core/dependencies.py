@@ -1,12 +1,15 @@
+import hashlib
 from typing import Optional
 from uuid import UUID
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 
+from app.core.config import settings
 from app.core.database import get_db
-from app.core.security import verify_token
+from app.core.security import verify_token_cached
+from app.crud.feed import FeedOwnershipLoader
+from app.crud.user import user as user_crud
 from app.models.user import User
 from app.schemas.user import TokenData
 
@@ -64,8 +67,8 @@ async def get_current_user(
     # Extract token
     token = credentials.credentials
     
-    # Verify and decode token
-    payload = verify_token(token, token_type="access")
+    # Verify and decode token (repeat tokens are served from cache)
+    payload = verify_token_cached(token, token_type="access")
     if payload is None:
         raise credentials_exception
     
@@ -79,9 +82,8 @@ async def get_current_user(
     except ValueError:
         raise credentials_exception
     
-    # Get user from database
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
+    # Get user from database (recent users are served from cache)
+    user = await user_crud.get_cached(db, id=user_id)
     
     if user is None:
         raise credentials_exception
@@ -95,27 +97,9 @@ async def get_current_user(
     return user
 
 
-async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
-    """
-    Dependency to get current active user
-    
-    Args:
-        current_user: Current user from get_current_user dependency
-        
-    Returns:
-        Current active user
-        
-    Raises:
-        HTTPException: If user is not active
-    """
-    if not current_user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Inactive user"
-        )
-    return current_user
+# get_current_user already rejects inactive users; the alias keeps existing
+# route signatures while resolving as a single dependency per request
+get_current_active_user = get_current_user
 
 
 def verify_agent_api_key(api_key: str) -> bool:
@@ -128,5 +112,16 @@ def verify_agent_api_key(api_key: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    from app.core.config import settings
-    return api_key in settings.agent_api_keys_list
+    return hashlib.sha256(api_key.encode()).digest() in settings.agent_api_key_hashes
+
+
+async def get_feed_ownership_loader(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+) -> FeedOwnershipLoader:
+    """
+    Dependency providing the request's feed ownership loader.
+    FastAPI caches dependencies per request, so every endpoint parameter
+    asking for it shares one instance (and one batch).
+    """
+    return FeedOwnershipLoader(db, current_user.id)
@@ -0,0 +1,167 @@
+from typing import Iterable, List, Optional, Tuple
+
+import xxhash
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.exceptions import HTTPException
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.database import AsyncSessionLocal
+from app.core.responses import ORJSONResponse
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if if_none_match.strip() == "*":
+        return True
+    tag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == tag
+        for candidate in if_none_match.split(",")
+    )
+
+
+class DBSessionMiddleware:
+    """
+    Open one AsyncSession per HTTP request and expose it as request.state.db.
+
+    Written as plain ASGI rather than BaseHTTPMiddleware so the session stays
+    open until the response body has been fully sent, which streaming
+    endpoints rely on. The session only checks out a pooled connection on its
+    first query, so requests that never touch the DB cost nothing.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async with AsyncSessionLocal() as session:
+            scope.setdefault("state", {})["db"] = session
+            try:
+                await self.app(scope, receive, send)
+            except Exception:
+                await session.rollback()
+                raise
+
+
+class ETagMiddleware:
+    """
+    Conditional GET support.
+
+    Buffered JSON responses get an xxh64 ETag of their body; responses that
+    already carry an ETag (e.g. FileResponse) keep theirs. When the request's
+    If-None-Match matches, a bodyless 304 is sent instead. Streaming responses
+    (no Content-Length) pass through untouched so they are never buffered.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        start: Optional[Message] = None
+        body: List[bytes] = []
+        mode = "pass"  # pass | buffer | not-modified
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, mode
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if message["status"] != 200:
+                    await send(message)
+                elif "etag" in headers:
+                    if if_none_match and _etag_matches(if_none_match, headers["etag"]):
+                        mode = "not-modified"
+                        await send(self._not_modified(message))
+                    else:
+                        await send(message)
+                elif "content-length" in headers and headers.get("content-type", "").startswith("application/json"):
+                    mode = "buffer"
+                    start = message
+                else:
+                    await send(message)
+                return
+
+            if mode == "pass":
+                await send(message)
+                return
+            if mode == "not-modified":
+                # Swallow the body but still close the response
+                if message["type"] == "http.response.pathsend" or not message.get("more_body", False):
+                    await send({"type": "http.response.body", "body": b""})
+                return
+
+            body.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            content = b"".join(body)
+            etag = f'"{xxhash.xxh64(content).hexdigest()}"'
+            MutableHeaders(raw=start["headers"]).append("etag", etag)
+            if if_none_match and _etag_matches(if_none_match, etag):
+                await send(self._not_modified(start))
+                await send({"type": "http.response.body", "body": b""})
+                return
+            await send(start)
+            await send({"type": "http.response.body", "body": content})
+
+        await self.app(scope, receive, send_wrapper)
+
+    @staticmethod
+    def _not_modified(start: Message) -> Message:
+        """304 start message keeping only the headers RFC 9110 allows"""
+        keep = {b"etag", b"cache-control", b"content-location", b"date", b"expires", b"vary", b"last-modified"}
+        headers: List[Tuple[bytes, bytes]] = [
+            (key, value) for key, value in start["headers"] if key.lower() in keep
+        ]
+        return {"type": "http.response.start", "status": 304, "headers": headers}
+
+
+class BodySizeLimitMiddleware:
+    """
+    Cap the request body size on selected paths.
+
+    A declared Content-Length over the limit is answered with 413 before the
+    app runs, so the multipart body is never parsed or spooled. Bodies without
+    a usable Content-Length (chunked uploads) are counted as they are received;
+    once over the limit, receive() raises a 413 HTTPException that FastAPI
+    passes through its body parsing to the regular exception handler.
+    """
+
+    def __init__(self, app: ASGIApp, *, max_size: int, paths: Iterable[str]):
+        self.app = app
+        self.max_size = max_size
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"File too large. Max size: {self.max_size} bytes"
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_size:
+            response = ORJSONResponse({"detail": detail}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def receive_wrapper() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_size:
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, receive_wrapper, send)
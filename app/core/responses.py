@@ -0,0 +1,46 @@
+from typing import Any, AsyncIterator, Callable, Iterable, Mapping, Optional
+
+import orjson
+from fastapi.responses import ORJSONResponse as _ORJSONResponse, StreamingResponse
+
+# Matches Pydantic's JSON output, so hand-built and response_model payloads
+# write UTC datetimes the same way ("...Z" rather than "...+00:00")
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+
+
+class ORJSONResponse(_ORJSONResponse):
+    """ORJSONResponse that writes UTC datetimes with a Z suffix"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+def row_to_dict(row: Any, fields: Iterable[str]) -> dict:
+    """
+    Build a response-schema-shaped dict straight from a trusted ORM row or
+    Row, reading the given attribute names. List and bulk endpoints use this
+    to skip per-row Pydantic validation; the field names must match the schema.
+    """
+    return {field: getattr(row, field) for field in fields}
+
+
+def stream_json_array(
+    rows: AsyncIterator[Any],
+    to_dict: Callable[[Any], dict],
+    headers: Optional[Mapping[str, str]] = None
+) -> StreamingResponse:
+    """
+    Stream rows out as a JSON array, one element at a time.
+    Only the current DB batch is held in memory instead of the full result.
+    """
+    async def generate() -> AsyncIterator[bytes]:
+        yield b"["
+        first = True
+        async for row in rows:
+            if not first:
+                yield b","
+            yield orjson.dumps(to_dict(row), option=ORJSON_OPTIONS)
+            first = False
+        yield b"]"
+
+    return StreamingResponse(generate(), media_type="application/json", headers=headers)
@@ -1,12 +1,30 @@
-from datetime import datetime, timedelta
-from typing import Optional
+import hashlib
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Optional, Tuple
 from uuid import UUID
-from jose import JWTError, jwt
+from fastapi.concurrency import run_in_threadpool
+import jwt
+from jwt import InvalidTokenError
 from passlib.context import CryptContext
+from app.core.cache import TTLCache
 from app.core.config import settings
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# Password hashing context; hashes made with other parameters are flagged for rehash
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__memory_cost=settings.ARGON2_MEMORY_COST,
+    argon2__time_cost=settings.ARGON2_TIME_COST,
+    argon2__parallelism=settings.ARGON2_PARALLELISM,
+)
+
+
+@lru_cache(maxsize=1)
+def get_signing_key() -> Any:
+    """Prepare the JWT signing key once instead of on every encode/decode"""
+    return jwt.get_algorithm_by_name(settings.ALGORITHM).prepare_key(settings.SECRET_KEY)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -15,10 +33,32 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password using bcrypt"""
+    """Hash a password using argon2"""
     return pwd_context.hash(password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a new hash if the stored one uses outdated parameters"""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in the threadpool so argon2 does not block the event loop"""
+    return await run_in_threadpool(verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(
+    plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """verify_and_update_password in the threadpool"""
+    return await run_in_threadpool(verify_and_update_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password in the threadpool so argon2 does not block the event loop"""
+    return await run_in_threadpool(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token
@@ -31,17 +71,18 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         Encoded JWT access token
     """
     to_encode = data.copy()
+    now = datetime.now(timezone.utc)
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        expire = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
     to_encode.update({
         "exp": expire,
-        "iat": datetime.utcnow(),
+        "iat": now,
         "type": "access"
     })
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, get_signing_key(), algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
@@ -56,14 +97,15 @@ def create_refresh_token(data: dict) -> str:
         Encoded JWT refresh token
     """
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    now = datetime.now(timezone.utc)
+    expire = now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
 
     to_encode.update({
         "exp": expire,
-        "iat": datetime.utcnow(),
+        "iat": now,
         "type": "refresh"
     })
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, get_signing_key(), algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
@@ -79,15 +121,42 @@ def verify_token(token: str, token_type: str = "access") -> Optional[dict]:
         Decoded token payload or None if invalid
     """
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = jwt.decode(token, get_signing_key(), algorithms=[settings.ALGORITHM])
         
         # Verify token type
         if payload.get("type") != token_type:
             return None
         
         return payload
-    except JWTError:
+    except InvalidTokenError:
+        return None
+
+
+async def verify_token_async(token: str, token_type: str = "access") -> Optional[dict]:
+    """Verify a JWT token in the threadpool so the signature check does not block the event loop"""
+    return await run_in_threadpool(verify_token, token, token_type)
+
+
+# Recently verified payloads, so repeat requests with the same token skip the JWT decode
+_verified_tokens = TTLCache(ttl=60, maxsize=10_000)
+
+
+def verify_token_cached(token: str, token_type: str = "access") -> Optional[dict]:
+    """
+    verify_token with a short-lived cache of successful results.
+    Keys are token digests so raw tokens are not kept in memory. Entries never
+    outlive the token's `exp`, which is also re-checked on every hit.
+    """
+    key = (hashlib.blake2b(token.encode(), digest_size=16).digest(), token_type)
+    payload = _verified_tokens.get(key)
+    if payload is None:
+        payload = verify_token(token, token_type)
+        if payload is not None:
+            _verified_tokens.set(key, payload, ttl=payload.get("exp", 0) - time.time())
+        return payload
+    if payload.get("exp", 0) <= time.time():
         return None
+    return payload
 
 
 def decode_token(token: str) -> Optional[dict]:
@@ -101,9 +170,9 @@ def decode_token(token: str) -> Optional[dict]:
         Decoded token payload or None if invalid
     """
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM], options={"verify_signature": False})
+        payload = jwt.decode(token, get_signing_key(), algorithms=[settings.ALGORITHM], options={"verify_signature": False})
         return payload
-    except JWTError:
+    except InvalidTokenError:
         return None
 
 
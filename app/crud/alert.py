@@ -1,25 +1,49 @@
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List, Tuple
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
-from sqlalchemy.orm import selectinload
+from sqlalchemy import bindparam, select, desc, func, tuple_
+from sqlalchemy.orm import aliased, selectinload
 
 from app.models.alert import Alert, AlertAIAnalysis, AlertAction, AlertStatus
+from app.models.feed import CameraFeed
+from app.crud.analytics import analytics as analytics_crud
 from app.schemas.alert import AlertCreate, AlertUpdate, AlertResolve
 
+# Fixed-shape lookup built once; executing it skips statement construction
+_ALERT_BY_ID = (
+    select(Alert)
+    .options(
+        selectinload(Alert.ai_analysis),
+        selectinload(Alert.actions)
+    )
+    .where(Alert.id == bindparam("id"))
+)
+
+
+async def _empty() -> AsyncIterator[Alert]:
+    return
+    yield
+
+
 class CRUDAlert:
     async def get(self, db: AsyncSession, id: UUID) -> Optional[Alert]:
         """Get alert by ID with relations loaded"""
+        result = await db.execute(_ALERT_BY_ID, {"id": id})
+        return result.scalar_one_or_none()
+
+    async def get_with_feed(self, db: AsyncSession, id: UUID) -> Optional[Tuple[Alert, UUID]]:
+        """Get alert by ID together with the owning feed's user_id"""
         result = await db.execute(
-            select(Alert)
+            select(Alert, CameraFeed.user_id)
+            .join(CameraFeed, Alert.feed_id == CameraFeed.id)
             .options(
                 selectinload(Alert.ai_analysis),
                 selectinload(Alert.actions)
             )
             .where(Alert.id == id)
         )
-        return result.scalar_one_or_none()
+        return result.one_or_none()
 
     async def get_multi(
         self,
@@ -29,13 +53,16 @@ class CRUDAlert:
         limit: int = 100,
         feed_id: Optional[UUID] = None,
         status: Optional[str] = None,
-        severity: Optional[str] = None
+        severity: Optional[str] = None,
+        include_relations: bool = False
     ) -> List[Alert]:
-        """Get alerts with filtering"""
-        query = select(Alert).options(
-            selectinload(Alert.ai_analysis),
-            selectinload(Alert.actions)
-        )
+        """Get alerts with filtering; analysis and actions are loaded only on request"""
+        query = select(Alert)
+        if include_relations:
+            query = query.options(
+                selectinload(Alert.ai_analysis),
+                selectinload(Alert.actions)
+            )
         
         if feed_id:
             query = query.where(Alert.feed_id == feed_id)
@@ -51,52 +78,186 @@ class CRUDAlert:
         result = await db.execute(query)
         return result.scalars().all()
 
-    async def create(self, db: AsyncSession, *, obj_in: AlertCreate) -> Alert:
-        """Create new alert with analysis and actions"""
-        # Create alert
-        db_obj = Alert(
-            feed_id=obj_in.feed_id,
-            title=obj_in.title,
-            description=obj_in.description,
-            status=obj_in.status.value,
-            severity=obj_in.severity.value,
-            alert_type=obj_in.alert_type.value,
-            video_url=obj_in.video_url,
-            thumbnail_url=obj_in.thumbnail_url
+    def _filtered_for_user(
+        self,
+        *,
+        user_id: UUID,
+        feed_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        severity: Optional[str] = None
+    ):
+        """Alerts on the user's feeds matching the filters, without paging"""
+        query = (
+            select(Alert)
+            .join(CameraFeed, Alert.feed_id == CameraFeed.id)
+            .where(CameraFeed.user_id == user_id)
         )
-        db.add(db_obj)
-        await db.flush()  # Get ID
+        if feed_id:
+            query = query.where(Alert.feed_id == feed_id)
+        if status:
+            query = query.where(Alert.status == status)
+        if severity:
+            query = query.where(Alert.severity == severity)
+        return query
+
+    @staticmethod
+    def _page(
+        query,
+        entity,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        before_ts: Optional[datetime] = None,
+        before_id: Optional[UUID] = None,
+        include_relations: bool = True
+    ):
+        """Apply relation loading, the keyset cursor and newest-first paging for entity"""
+        if include_relations:
+            # Two extra SELECT ... IN queries per batch; skipped for summary lists
+            query = query.options(
+                selectinload(entity.ai_analysis),
+                selectinload(entity.actions)
+            )
+        if before_ts and before_id:
+            query = query.where(tuple_(entity.created_at, entity.id) < tuple_(before_ts, before_id))
+        elif before_ts:
+            query = query.where(entity.created_at < before_ts)
 
+        # Order by newest first; id breaks ties so keyset pages are stable
+        query = query.order_by(desc(entity.created_at), desc(entity.id))
+        if skip:
+            query = query.offset(skip)
+        return query.limit(limit)
+
+    def _multi_for_user_query(
+        self,
+        *,
+        user_id: UUID,
+        feed_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        severity: Optional[str] = None,
+        **page
+    ):
+        """Build the filtered, keyset-ordered alerts query for a user"""
+        query = self._filtered_for_user(
+            user_id=user_id, feed_id=feed_id, status=status, severity=severity
+        )
+        return self._page(query, Alert, **page)
+
+    async def get_multi_for_user(self, db: AsyncSession, **filters) -> List[Alert]:
+        """
+        Get alerts on feeds owned by a user, filtered in a single query.
+        Accepts user_id, skip, limit, feed_id, status, severity, before_ts,
+        before_id and include_relations. Pass the last seen (created_at, id) as before_ts/before_id
+        for keyset pagination; skip is kept for OFFSET-style callers.
+        """
+        result = await db.execute(self._multi_for_user_query(**filters))
+        return result.scalars().all()
+
+    async def stream_multi_for_user(
+        self, db: AsyncSession, *, batch_size: int = 200, **filters
+    ) -> AsyncIterator[Alert]:
+        """Same as get_multi_for_user, but yields alerts batch by batch"""
+        query = self._multi_for_user_query(**filters).execution_options(yield_per=batch_size)
+        async for alert in await db.stream_scalars(query):
+            yield alert
+
+    async def stream_multi_for_user_with_total(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: UUID,
+        feed_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        severity: Optional[str] = None,
+        batch_size: int = 200,
+        **page
+    ) -> Tuple[int, AsyncIterator[Alert]]:
+        """
+        Like stream_multi_for_user, plus the total number of alerts matching the
+        filters regardless of the page. COUNT(*) OVER () runs in a subquery over
+        the filtered set, and the cursor/OFFSET/LIMIT are applied outside it, so
+        rows and count share one round trip. An empty page (e.g. past the end)
+        falls back to a plain COUNT.
+        """
+        filtered = self._filtered_for_user(
+            user_id=user_id, feed_id=feed_id, status=status, severity=severity
+        )
+        counted = filtered.add_columns(func.count().over().label("total")).subquery()
+        alert = aliased(Alert, counted)
+        query = self._page(
+            select(alert, counted.c.total), alert, **page
+        ).execution_options(yield_per=batch_size)
+
+        result = await db.stream(query)
+        first = await result.fetchone()
+        if first is None:
+            await result.close()
+            total = await db.scalar(select(func.count()).select_from(filtered.subquery()))
+            return total, _empty()
+
+        async def alerts() -> AsyncIterator[Alert]:
+            yield first[0]
+            async for row in result:
+                yield row[0]
+
+        return first.total, alerts()
+
+    async def create(self, db: AsyncSession, *, obj_in: AlertCreate) -> Alert:
+        """
+        Create new alert with analysis and actions.
+        Children are attached in memory and written in one flush at commit;
+        server defaults come back via RETURNING, so no reload is needed.
+        """
         # Create AI Analysis if provided
+        analysis_obj = None
         if obj_in.ai_analysis:
             analysis_data = obj_in.ai_analysis
             analysis_obj = AlertAIAnalysis(
-                alert_id=db_obj.id,
                 confidence_score=analysis_data.confidence_score,
                 detected_objects=analysis_data.detected_objects,
                 scene_description=analysis_data.scene_description,
                 risk_factors=analysis_data.risk_factors,
                 recommendations=analysis_data.recommendations
             )
-            db.add(analysis_obj)
 
         # Create Actions if provided
-        if obj_in.actions:
-            for action_data in obj_in.actions:
-                action_obj = AlertAction(
-                    alert_id=db_obj.id,
-                    action_type=action_data.action_type,
-                    recipient=action_data.recipient,
-                    status=action_data.status,
-                    details=action_data.details
-                )
-                db.add(action_obj)
-            
+        actions = [
+            AlertAction(
+                action_type=action_data.action_type,
+                recipient=action_data.recipient,
+                status=action_data.status,
+                details=action_data.details
+            )
+            for action_data in obj_in.actions or []
+        ]
+
+        # Create alert; the relationships fill in alert_id on flush
+        db_obj = Alert(
+            feed_id=obj_in.feed_id,
+            title=obj_in.title,
+            description=obj_in.description,
+            status=obj_in.status.value,
+            severity=obj_in.severity.value,
+            alert_type=obj_in.alert_type.value,
+            video_url=obj_in.video_url,
+            thumbnail_url=obj_in.thumbnail_url,
+            ai_analysis=analysis_obj,
+            actions=actions
+        )
+        db.add(db_obj)
+
+        # Keep the daily call/SMS rollup in step with the new actions
+        action_types = [action.action_type for action in actions]
+        calls = action_types.count("call")
+        sms = action_types.count("sms")
+        if calls or sms:
+            await analytics_crud.bump_daily_stats(
+                db, feed_id=obj_in.feed_id, calls=calls, sms=sms
+            )
+
         await db.commit()
-        await db.refresh(db_obj)
-        
-        # Reload with relations
-        return await self.get(db, db_obj.id)
+        return db_obj
 
     async def update(
         self, db: AsyncSession, *, db_obj: Alert, obj_in: AlertUpdate | dict
@@ -118,7 +279,6 @@ class CRUDAlert:
 
         db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
 
     async def resolve(
@@ -128,11 +288,10 @@ class CRUDAlert:
         db_obj.status = obj_in.status.value
         db_obj.resolution_notes = obj_in.resolution_notes
         db_obj.resolved_by = user_id
-        db_obj.resolved_at = datetime.utcnow()
+        db_obj.resolved_at = datetime.now(timezone.utc)
         
         db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
 
 alert = CRUDAlert()
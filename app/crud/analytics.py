@@ -1,13 +1,16 @@
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List
 from uuid import UUID
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, func
-from sqlalchemy.orm import selectinload
+from collections import Counter
+from sqlalchemy import bindparam, select, insert, desc, func, true, literal, null, union_all, tuple_
+from sqlalchemy.orm import aliased, selectinload
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
-from app.models.analytics import SystemMetric, Detection, AgentSession
+from app.models.analytics import SystemMetric, Detection, AgentSession, DailyStat
 from app.models.alert import Alert, AlertAction
 from app.models.log import SystemLog
+from app.models.feed import CameraFeed, FeedSettings
 from app.schemas.analytics import (
     SystemMetricCreate,
     DetectionCreate,
@@ -15,6 +18,11 @@ from app.schemas.analytics import (
     AgentSessionUpdate
 )
 
+# Fixed-shape counts built once; executing them skips statement construction
+_COUNT_ACTIVE_ALERTS = select(func.count()).select_from(Alert).where(Alert.status == "active")
+_COUNT_ACTIVE_ALERTS_FOR_FEED = _COUNT_ACTIVE_ALERTS.where(Alert.feed_id == bindparam("feed_id"))
+
+
 class CRUDAnalytics:
     # System Metrics
     async def create_metric(self, db: AsyncSession, *, obj_in: SystemMetricCreate) -> SystemMetric:
@@ -27,22 +35,42 @@ class CRUDAnalytics:
         )
         db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
 
+    async def create_metrics_bulk(
+        self, db: AsyncSession, *, objs_in: List[SystemMetricCreate]
+    ) -> List[SystemMetric]:
+        """Insert a batch of system metrics in one executemany round trip"""
+        if not objs_in:
+            return []
+        result = await db.scalars(
+            insert(SystemMetric).returning(SystemMetric),
+            [obj_in.model_dump() for obj_in in objs_in]
+        )
+        metrics = result.all()
+        await db.commit()
+        return metrics
+
     async def get_latest_metrics_by_feed(self, db: AsyncSession) -> List[SystemMetric]:
         """Get the most recent system metric for each feed"""
-        # PostgreSQL specific 'DISTINCT ON' is efficient for this
-        result = await db.execute(
+        # One LIMIT 1 index seek per feed on (feed_id, created_at DESC) via a
+        # LATERAL join, instead of sorting the whole table for DISTINCT ON
+        latest = (
             select(SystemMetric)
-            .distinct(SystemMetric.feed_id)
-            .order_by(SystemMetric.feed_id, desc(SystemMetric.created_at))
+            .where(SystemMetric.feed_id == CameraFeed.id)
+            .order_by(desc(SystemMetric.created_at))
+            .limit(1)
+            .lateral("latest_metric")
+        )
+        latest_metric = aliased(SystemMetric, latest)
+        result = await db.execute(
+            select(latest_metric).select_from(CameraFeed).join(latest, true())
         )
         return result.scalars().all()
 
     async def get_avg_metrics(self, db: AsyncSession, *, hours: int = 24) -> dict:
         """Get average metrics for the last N hours"""
-        since = datetime.utcnow() - timedelta(hours=hours)
+        since = datetime.now(timezone.utc) - timedelta(hours=hours)
         result = await db.execute(
             select(
                 func.avg(SystemMetric.network_latency).label("avg_latency")
@@ -54,8 +82,9 @@ class CRUDAnalytics:
         }
 
     # Detections
-    async def create_detection(self, db: AsyncSession, *, obj_in: DetectionCreate) -> Detection:
-        """Create new detection"""
+    @staticmethod
+    def _detection_values(obj_in: DetectionCreate) -> dict:
+        """Column values for a new detection row"""
         # Map risk_level to detection_type if detection_type is missing
         detection_type = obj_in.detection_type
         if not detection_type and obj_in.risk_level:
@@ -65,21 +94,75 @@ class CRUDAnalytics:
         if not detection_type:
             detection_type = "unknown"
 
-        db_obj = Detection(
-            feed_id=obj_in.feed_id,
-            alert_id=obj_in.alert_id,
-            detection_type=detection_type,
-            confidence=obj_in.confidence,
-            description=obj_in.description,
-            context_tags=obj_in.context_tags,
-            bounding_box=obj_in.bounding_box,
-            frame_id=obj_in.frame_id
-        )
+        return {
+            "feed_id": obj_in.feed_id,
+            "alert_id": obj_in.alert_id,
+            "detection_type": detection_type,
+            "confidence": obj_in.confidence,
+            "description": obj_in.description,
+            "context_tags": obj_in.context_tags,
+            "bounding_box": obj_in.bounding_box,
+            "frame_id": obj_in.frame_id
+        }
+
+    async def create_detection(self, db: AsyncSession, *, obj_in: DetectionCreate) -> Detection:
+        """Create new detection"""
+        db_obj = Detection(**self._detection_values(obj_in))
         db.add(db_obj)
+        await self.bump_daily_stats(db, feed_id=obj_in.feed_id, detections=1)
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
 
+    async def create_detections_bulk(
+        self, db: AsyncSession, *, objs_in: List[DetectionCreate]
+    ) -> List[Detection]:
+        """
+        Insert a batch of detections in one executemany round trip and
+        bump the daily rollup once per feed, all in a single commit.
+        """
+        if not objs_in:
+            return []
+        result = await db.scalars(
+            insert(Detection).returning(Detection),
+            [self._detection_values(obj_in) for obj_in in objs_in]
+        )
+        detections = result.all()
+        for feed_id, count in Counter(obj_in.feed_id for obj_in in objs_in).items():
+            await self.bump_daily_stats(db, feed_id=feed_id, detections=count)
+        await db.commit()
+        return detections
+
+    # Daily rollup
+    async def bump_daily_stats(
+        self,
+        db: AsyncSession,
+        *,
+        feed_id: UUID,
+        calls: int = 0,
+        sms: int = 0,
+        detections: int = 0
+    ) -> None:
+        """
+        Increment today's rollup counters for a feed (UTC day).
+        Runs in the caller's transaction; the caller commits.
+        """
+        stmt = pg_insert(DailyStat).values(
+            day=datetime.now(timezone.utc).date(),
+            feed_id=feed_id,
+            calls=calls,
+            sms=sms,
+            detections=detections
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DailyStat.day, DailyStat.feed_id],
+            set_={
+                "calls": DailyStat.calls + stmt.excluded.calls,
+                "sms": DailyStat.sms + stmt.excluded.sms,
+                "detections": DailyStat.detections + stmt.excluded.detections
+            }
+        )
+        await db.execute(stmt)
+
     async def get_recent_detections(
         self, db: AsyncSession, *, skip: int = 0, limit: int = 100, feed_id: Optional[UUID] = None
     ) -> List[Detection]:
@@ -93,6 +176,83 @@ class CRUDAnalytics:
         result = await db.execute(query)
         return result.scalars().all()
 
+    async def stream_recent_detections(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        feed_id: Optional[UUID] = None,
+        context_tag: Optional[str] = None,
+        batch_size: int = 200
+    ) -> AsyncIterator[Detection]:
+        """Get recent detections, yielded batch by batch"""
+        query = select(Detection).order_by(desc(Detection.timestamp))
+        
+        if feed_id:
+            query = query.where(Detection.feed_id == feed_id)
+        if context_tag:
+            # JSONB containment, served by the GIN index on context_tags
+            query = query.where(Detection.context_tags.contains([context_tag]))
+        
+        query = query.offset(skip).limit(limit).execution_options(yield_per=batch_size)
+        async for detection in await db.stream_scalars(query):
+            yield detection
+
+    async def get_activity_feed(
+        self,
+        db: AsyncSession,
+        *,
+        limit: int = 20,
+        before_ts: Optional[datetime] = None,
+        before_id: Optional[UUID] = None
+    ) -> list:
+        """
+        Get the newest alerts and detections merged into one timeline.
+        Both sources are combined with UNION ALL so the database returns the
+        correct top-N across types, already ordered. before_ts/before_id is
+        the keyset cursor (last item's timestamp and id).
+        """
+        alerts = select(
+            Alert.id.label("id"),
+            literal("alert").label("type"),
+            Alert.title.label("title"),
+            func.coalesce(Alert.description, "").label("description"),
+            Alert.created_at.label("timestamp"),
+            Alert.severity.label("severity"),
+            Alert.feed_id.label("feed_id")
+        )
+        detections = select(
+            Detection.id.label("id"),
+            literal("detection").label("type"),
+            func.concat(
+                func.upper(func.left(Detection.detection_type, 1)),
+                func.lower(func.substr(Detection.detection_type, 2)),
+                " detected"
+            ).label("title"),
+            func.concat(
+                "Confidence: ", func.to_char(Detection.confidence * 100, "FM990.00"), "%"
+            ).label("description"),
+            Detection.timestamp.label("timestamp"),
+            null().label("severity"),
+            Detection.feed_id.label("feed_id")
+        )
+        # Apply the cursor inside each branch so both can use their indexes
+        if before_ts and before_id:
+            alerts = alerts.where(tuple_(Alert.created_at, Alert.id) < tuple_(before_ts, before_id))
+            detections = detections.where(tuple_(Detection.timestamp, Detection.id) < tuple_(before_ts, before_id))
+        elif before_ts:
+            alerts = alerts.where(Alert.created_at < before_ts)
+            detections = detections.where(Detection.timestamp < before_ts)
+        activity = union_all(alerts, detections).subquery("activity")
+
+        result = await db.execute(
+            select(activity)
+            .order_by(desc(activity.c.timestamp), desc(activity.c.id))
+            .limit(limit)
+        )
+        return result.all()
+
     async def count_detections_since(self, db: AsyncSession, *, since: datetime, feed_id: Optional[UUID] = None) -> int:
         """Count detections since a given time"""
         query = select(func.count(Detection.id)).where(Detection.timestamp >= since)
@@ -106,7 +266,7 @@ class CRUDAnalytics:
         query = (
             select(
                 Detection.detection_type,
-                func.count(Detection.id).label("count")
+                func.count().label("count")
             )
             .where(Detection.timestamp >= since)
         )
@@ -115,8 +275,30 @@ class CRUDAnalytics:
             
         query = query.group_by(Detection.detection_type)
         
+        # (type, count) pairs convert straight into the dict
+        result = await db.execute(query)
+        return dict(result.all())
+
+    async def get_hourly_detection_trends(
+        self, db: AsyncSession, *, since: datetime, feed_id: Optional[UUID] = None
+    ) -> list:
+        """Get average detection confidence and count per hour since a given time"""
+        bucket = func.date_trunc("hour", Detection.timestamp).label("bucket")
+        query = (
+            select(
+                bucket,
+                func.avg(Detection.confidence).label("avg_confidence"),
+                func.count().label("count")
+            )
+            .where(Detection.timestamp >= since)
+        )
+        if feed_id:
+            query = query.where(Detection.feed_id == feed_id)
+
+        query = query.group_by(bucket).order_by(bucket)
+
         result = await db.execute(query)
-        return {row.detection_type: row.count for row in result}
+        return result.all()
 
     async def get_detection(self, db: AsyncSession, *, id: UUID) -> Optional[Detection]:
         """Get detection by ID"""
@@ -131,7 +313,6 @@ class CRUDAnalytics:
         
         db.add(detection)
         await db.commit()
-        await db.refresh(detection)
         return detection
 
     # Agent Sessions
@@ -148,7 +329,6 @@ class CRUDAnalytics:
         )
         db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
 
     async def update_agent_session(
@@ -161,11 +341,10 @@ class CRUDAnalytics:
             setattr(db_obj, field, value)
         
         # Update heartbeat
-        db_obj.last_heartbeat = datetime.utcnow()
+        db_obj.last_heartbeat = datetime.now(timezone.utc)
         
         db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
 
     async def get_active_agent_sessions(self, db: AsyncSession) -> List[AgentSession]:
@@ -175,17 +354,66 @@ class CRUDAnalytics:
         )
         return result.scalars().all()
 
+    async def get_feeds_with_uptime(
+        self, db: AsyncSession, *, user_id: UUID, limit: int = 100
+    ) -> list:
+        """
+        Get a user's feeds with sensitivity and agent uptime (seconds).
+        Uptime is measured from the latest active agent session, in SQL.
+        Each row also carries total_active, the user's active feed count.
+        """
+        sessions = (
+            select(
+                AgentSession.feed_id,
+                func.max(AgentSession.started_at).label("started_at")
+            )
+            .where(AgentSession.status == "active")
+            .group_by(AgentSession.feed_id)
+            .subquery("active_sessions")
+        )
+        uptime = func.coalesce(
+            func.extract("epoch", func.now() - sessions.c.started_at), 0
+        )
+
+        result = await db.execute(
+            select(
+                CameraFeed.id,
+                CameraFeed.name,
+                CameraFeed.status,
+                func.coalesce(FeedSettings.sensitivity, "medium").label("sensitivity"),
+                func.floor(uptime).label("uptime"),
+                # Window over all the user's feeds, evaluated before LIMIT
+                func.count().filter(CameraFeed.status == "active").over().label("total_active")
+            )
+            .select_from(CameraFeed)
+            .outerjoin(sessions, sessions.c.feed_id == CameraFeed.id)
+            .outerjoin(FeedSettings, FeedSettings.feed_id == CameraFeed.id)
+            .where(CameraFeed.user_id == user_id)
+            .limit(limit)
+        )
+        return result.all()
+
+    async def get_active_session_totals(self, db: AsyncSession):
+        """Sum frames processed and detections across active agent sessions"""
+        result = await db.execute(
+            select(
+                func.coalesce(func.sum(AgentSession.frames_processed), 0).label("total_frames"),
+                func.coalesce(func.sum(AgentSession.detections_count), 0).label("total_detections")
+            ).where(AgentSession.status == "active")
+        )
+        return result.one()
+
     async def count_active_alerts(self, db: AsyncSession, feed_id: Optional[UUID] = None) -> int:
         """Count active alerts"""
-        query = select(func.count(Alert.id)).where(Alert.status == "active")
         if feed_id:
-            query = query.where(Alert.feed_id == feed_id)
-        result = await db.execute(query)
+            result = await db.execute(_COUNT_ACTIVE_ALERTS_FOR_FEED, {"feed_id": feed_id})
+        else:
+            result = await db.execute(_COUNT_ACTIVE_ALERTS)
         return result.scalar()
 
     async def count_actions_today(self, db: AsyncSession, *, action_type: str, feed_id: Optional[UUID] = None) -> int:
         """Count actions of a specific type today"""
-        today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
         query = (
             select(func.count(AlertAction.id))
             .join(Alert, AlertAction.alert_id == Alert.id)
@@ -198,4 +426,58 @@ class CRUDAnalytics:
         result = await db.execute(query)
         return result.scalar()
 
+    async def quick_stats(
+        self,
+        db: AsyncSession,
+        *,
+        user_id: UUID,
+        today_start: datetime,
+        this_hour_start: datetime,
+        feed_id: Optional[UUID] = None
+    ):
+        """
+        Compute all dashboard quick stats for a user's feeds in one statement.
+        Daily counters come from the daily_stats rollup (one row per feed);
+        the hourly and active-alert counts are read live.
+        """
+        owned_feeds = select(CameraFeed.id).where(CameraFeed.user_id == user_id)
+        if feed_id:
+            owned_feeds = owned_feeds.where(CameraFeed.id == feed_id)
+        owned_feeds = owned_feeds.scalar_subquery()
+
+        daily = (
+            select(
+                func.coalesce(func.sum(DailyStat.calls), 0).label("calls_triggered"),
+                func.coalesce(func.sum(DailyStat.sms), 0).label("sms_sent"),
+                func.coalesce(func.sum(DailyStat.detections), 0).label("events_today")
+            )
+            .where(DailyStat.day == today_start.date())
+            .where(DailyStat.feed_id.in_(owned_feeds))
+            .cte("daily_counts")
+        )
+        detections = (
+            select(func.count().label("detections_this_hour"))
+            .where(Detection.timestamp >= this_hour_start)
+            .where(Detection.feed_id.in_(owned_feeds))
+            .cte("detection_counts")
+        )
+        alerts = (
+            select(func.count().label("active_alerts"))
+            .where(Alert.status == "active")
+            .where(Alert.feed_id.in_(owned_feeds))
+            .cte("alert_counts")
+        )
+
+        result = await db.execute(
+            select(
+                daily.c.calls_triggered,
+                daily.c.sms_sent,
+                daily.c.events_today,
+                detections.c.detections_this_hour,
+                alerts.c.active_alerts
+            )
+            .select_from(daily.join(detections, true()).join(alerts, true()))
+        )
+        return result.one()
+
 analytics = CRUDAnalytics()
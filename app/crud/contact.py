@@ -1,15 +1,20 @@
 from typing import Optional, List
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, select, delete
 
+from app.crud.feed import active_feeds_cache
 from app.models.contact import AlertContact
+from app.models.feed import CameraFeed
 from app.schemas.contact import AlertContactCreate, AlertContactUpdate
 
+_CONTACT_BY_ID = select(AlertContact).where(AlertContact.id == bindparam("id"))
+
+
 class CRUDContact:
     async def get(self, db: AsyncSession, id: UUID) -> Optional[AlertContact]:
         """Get contact by ID"""
-        result = await db.execute(select(AlertContact).where(AlertContact.id == id))
+        result = await db.execute(_CONTACT_BY_ID, {"id": id})
         return result.scalar_one_or_none()
 
     async def get_multi_by_feed(
@@ -37,7 +42,7 @@ class CRUDContact:
         )
         db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
+        active_feeds_cache.invalidate()
         return db_obj
 
     async def update(
@@ -54,7 +59,7 @@ class CRUDContact:
 
         db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
+        active_feeds_cache.invalidate()
         return db_obj
 
     async def remove(self, db: AsyncSession, *, id: UUID) -> AlertContact:
@@ -62,6 +67,28 @@ class CRUDContact:
         obj = await self.get(db, id=id)
         await db.delete(obj)
         await db.commit()
+        active_feeds_cache.invalidate()
+        return obj
+
+    async def remove_scoped(
+        self, db: AsyncSession, *, contact_id: UUID, feed_id: UUID, user_id: UUID
+    ) -> Optional[AlertContact]:
+        """
+        Delete a contact only if it belongs to the feed and the feed to the user.
+        Ownership is checked inside the DELETE, so this is a single round trip.
+        """
+        result = await db.execute(
+            delete(AlertContact)
+            .where(
+                AlertContact.id == contact_id,
+                AlertContact.feed_id == feed_id,
+                AlertContact.feed.has(CameraFeed.user_id == user_id)
+            )
+            .returning(AlertContact)
+        )
+        obj = result.scalar_one_or_none()
+        await db.commit()
+        active_feeds_cache.invalidate()
         return obj
 
 contact = CRUDContact()
@@ -1,51 +1,191 @@
-from typing import Optional, List
+import asyncio
+from typing import Dict, Iterable, Optional, List, Set
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, literal, update, delete, case, func, null
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app.models.feed import CameraFeed, FeedSettings
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.contact import AlertContact
+from app.models.feed import CameraFeed, FeedSettings, FeedStatus
 from app.schemas.feed import FeedCreate, FeedUpdate, FeedSettingsUpdate
 
+# Flat columns matching FeedResponse / AlertContactResponse, for hydration-free reads
+FEED_RESPONSE_COLUMNS = (
+    CameraFeed.id,
+    CameraFeed.user_id,
+    CameraFeed.name,
+    CameraFeed.feed_url,
+    CameraFeed.location,
+    CameraFeed.feed_type,
+    CameraFeed.custom_instruction,
+    CameraFeed.status,
+    CameraFeed.fps,
+    CameraFeed.rolling_confidence_sum,
+    CameraFeed.total_detection_count,
+    CameraFeed.start_time,
+    CameraFeed.created_at,
+    CameraFeed.updated_at,
+)
+CONTACT_RESPONSE_COLUMNS = (
+    AlertContact.id,
+    AlertContact.feed_id,
+    AlertContact.name,
+    AlertContact.phone,
+    AlertContact.email,
+    AlertContact.is_active,
+    AlertContact.created_at,
+    AlertContact.updated_at,
+)
+
+# The agent poller reads the active feed list on a fixed interval; writes
+# through this module invalidate it, other writers age out after the TTL
+active_feeds_cache = TTLCache(ttl=settings.ACTIVE_FEEDS_CACHE_TTL, maxsize=1)
+
+# Keeps get_many's IN lists well below the bind parameter limit
+GET_MANY_BATCH_SIZE = 500
+
+
 class CRUDFeed:
     async def get(self, db: AsyncSession, id: UUID) -> Optional[CameraFeed]:
         """Get feed by ID with settings loaded"""
         result = await db.execute(
             select(CameraFeed)
             .options(
-                selectinload(CameraFeed.settings),
+                joinedload(CameraFeed.settings),
                 selectinload(CameraFeed.contacts)
             )
             .where(CameraFeed.id == id)
         )
         return result.scalar_one_or_none()
 
+    async def get_many(self, db: AsyncSession, *, ids: Iterable[UUID]) -> List[CameraFeed]:
+        """
+        Get several feeds by ID with settings loaded, instead of calling get() per id.
+        Large id sets are split into batches of GET_MANY_BATCH_SIZE per query.
+        """
+        ids = list(dict.fromkeys(ids))
+        feeds: List[CameraFeed] = []
+        for start in range(0, len(ids), GET_MANY_BATCH_SIZE):
+            result = await db.execute(
+                select(CameraFeed)
+                .options(
+                    joinedload(CameraFeed.settings),
+                    selectinload(CameraFeed.contacts)
+                )
+                .where(CameraFeed.id.in_(ids[start:start + GET_MANY_BATCH_SIZE]))
+            )
+            feeds.extend(result.scalars().all())
+        return feeds
+
+    async def get_owned(self, db: AsyncSession, *, id: UUID, user_id: UUID) -> Optional[CameraFeed]:
+        """Get feed by ID only if it belongs to the user, with settings loaded"""
+        result = await db.execute(
+            select(CameraFeed)
+            .options(
+                joinedload(CameraFeed.settings),
+                selectinload(CameraFeed.contacts)
+            )
+            .where(CameraFeed.id == id, CameraFeed.user_id == user_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_owned_settings(
+        self, db: AsyncSession, *, feed_id: UUID, user_id: UUID
+    ) -> Optional[FeedSettings]:
+        """Get settings of a feed owned by the user without loading the feed"""
+        result = await db.execute(
+            select(FeedSettings)
+            .join(CameraFeed, FeedSettings.feed_id == CameraFeed.id)
+            .where(FeedSettings.feed_id == feed_id, CameraFeed.user_id == user_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_owned_ids(
+        self, db: AsyncSession, *, feed_ids: Iterable[UUID], user_id: UUID
+    ) -> Set[UUID]:
+        """Return the subset of feed_ids that belong to the user, in one query"""
+        result = await db.execute(
+            select(CameraFeed.id)
+            .where(CameraFeed.id.in_(list(feed_ids)), CameraFeed.user_id == user_id)
+        )
+        return set(result.scalars().all())
+
+    async def user_owns(self, db: AsyncSession, *, feed_id: UUID, user_id: UUID) -> bool:
+        """Check that a feed exists and belongs to the user without loading it"""
+        result = await db.scalar(
+            select(literal(1))
+            .where(CameraFeed.id == feed_id, CameraFeed.user_id == user_id)
+            .limit(1)
+        )
+        return result is not None
+
     async def get_multi_by_owner(
-        self, db: AsyncSession, *, user_id: UUID, skip: int = 0, limit: int = 100
+        self,
+        db: AsyncSession,
+        *,
+        user_id: UUID,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[UUID] = None
     ) -> List[CameraFeed]:
-        """Get all feeds for a user"""
-        result = await db.execute(
+        """
+        Get all feeds for a user, ordered by id.
+        Pass the last seen id as after_id to page without OFFSET.
+        """
+        query = (
             select(CameraFeed)
             .options(
-                selectinload(CameraFeed.settings),
+                joinedload(CameraFeed.settings),
                 selectinload(CameraFeed.contacts)
             )
             .where(CameraFeed.user_id == user_id)
-            .offset(skip)
-            .limit(limit)
         )
+        if after_id:
+            query = query.where(CameraFeed.id > after_id)
+        query = query.order_by(CameraFeed.id)
+        if skip:
+            query = query.offset(skip)
+        result = await db.execute(query.limit(limit))
         return result.scalars().all()
 
     async def get_all_active(
         self, db: AsyncSession
-    ) -> List[CameraFeed]:
-        """Get all active feeds for the agent"""
-        result = await db.execute(
-            select(CameraFeed)
-            .options(selectinload(CameraFeed.settings))
-            .where(CameraFeed.status == 'active')
+    ) -> List[dict]:
+        """
+        Get all active feeds for the agent as plain dicts in the FeedResponse
+        shape. Only the needed columns are selected and no ORM objects are built.
+        Served from active_feeds_cache; callers must not mutate the result.
+        """
+        return await active_feeds_cache.get_or_set(
+            "active_feeds", lambda: self._load_all_active(db)
         )
-        return result.scalars().all()
+
+    async def _load_all_active(self, db: AsyncSession) -> List[dict]:
+        feeds = (
+            await db.execute(
+                select(*FEED_RESPONSE_COLUMNS)
+                .where(CameraFeed.status == FeedStatus.ACTIVE.value)
+            )
+        ).mappings().all()
+        contacts = (
+            await db.execute(
+                select(*CONTACT_RESPONSE_COLUMNS)
+                .join(CameraFeed, AlertContact.feed_id == CameraFeed.id)
+                .where(CameraFeed.status == FeedStatus.ACTIVE.value)
+            )
+        ).mappings().all()
+
+        contacts_by_feed: Dict[UUID, List[dict]] = {}
+        for contact in contacts:
+            contacts_by_feed.setdefault(contact["feed_id"], []).append(dict(contact))
+
+        return [
+            {**feed, "contacts": contacts_by_feed.get(feed["id"], [])}
+            for feed in feeds
+        ]
 
     async def create_with_owner(
         self, db: AsyncSession, *, obj_in: FeedCreate, user_id: UUID
@@ -61,14 +201,11 @@ class CRUDFeed:
             custom_instruction=obj_in.custom_instruction,
             status=obj_in.status.value
         )
-        db.add(db_obj)
-        await db.flush()  # Get ID
 
         # Create settings
         settings_in = obj_in.settings
         if settings_in:
             settings_obj = FeedSettings(
-                feed_id=db_obj.id,
                 push_enabled=settings_in.push_enabled,
                 email_enabled=settings_in.email_enabled,
                 sms_enabled=settings_in.sms_enabled,
@@ -79,18 +216,16 @@ class CRUDFeed:
             )
         else:
             # Default settings
-            settings_obj = FeedSettings(feed_id=db_obj.id)
-            
-        db.add(settings_obj)
-        await db.commit()
+            settings_obj = FeedSettings()
 
-        # Reload the feed with settings relationship
-        result = await db.execute(
-            select(CameraFeed)
-            .options(selectinload(CameraFeed.settings))
-            .where(CameraFeed.id == db_obj.id)
-        )
-        return result.scalar_one()
+        # Attach in memory so the relationships FeedResponse serializes are
+        # populated without a reload; feed_id is filled in on flush
+        db_obj.settings = settings_obj
+        db_obj.contacts = []
+        db.add(db_obj)
+        await db.commit()
+        active_feeds_cache.invalidate()
+        return db_obj
 
     async def update(
         self, db: AsyncSession, *, db_obj: CameraFeed, obj_in: FeedUpdate | dict
@@ -107,51 +242,155 @@ class CRUDFeed:
         if "status" in update_data and hasattr(update_data["status"], "value"):
             update_data["status"] = update_data["status"].value
 
-        for field, value in update_data.items():
-            if field == "fps" and not value:
-                continue  # Skip updating fps if value is None or falsy
-            setattr(db_obj, field, value)
+        if "fps" in update_data and not update_data["fps"]:
+            del update_data["fps"]  # Skip updating fps if value is None or falsy
+        if not update_data:
+            return db_obj
 
-        db.add(db_obj)
+        # Callers pass a feed loaded with settings and contacts; a Core UPDATE
+        # leaves those untouched and only updated_at has to come back
+        updated_at = (
+            await db.execute(
+                update(CameraFeed)
+                .where(CameraFeed.id == db_obj.id)
+                .values(**update_data)
+                .returning(CameraFeed.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+        ).scalar_one()
         await db.commit()
+        for field, value in {**update_data, "updated_at": updated_at}.items():
+            set_committed_value(db_obj, field, value)
+        active_feeds_cache.invalidate()
+        return db_obj
 
-        # Reload the feed with settings relationship
+    async def toggle_owned(self, db: AsyncSession, *, id: UUID, user_id: UUID) -> Optional[CameraFeed]:
+        """
+        Flip a feed between active and inactive in one atomic UPDATE.
+        start_time is set when the feed becomes active and cleared otherwise.
+        Returns None if the feed does not exist or is not the user's.
+        """
+        becomes_active = CameraFeed.status == FeedStatus.INACTIVE.value
+        stmt = (
+            update(CameraFeed)
+            .where(CameraFeed.id == id, CameraFeed.user_id == user_id)
+            .values(
+                status=case(
+                    (becomes_active, FeedStatus.ACTIVE.value),
+                    else_=FeedStatus.INACTIVE.value
+                ),
+                start_time=case((becomes_active, func.now()), else_=null())
+            )
+            .returning(CameraFeed)
+        )
         result = await db.execute(
             select(CameraFeed)
-            .options(selectinload(CameraFeed.settings))
-            .where(CameraFeed.id == db_obj.id)
+            .from_statement(stmt)
+            .options(
+                # from_statement() cannot add joins, so settings stay on selectinload here
+                selectinload(CameraFeed.settings),
+                selectinload(CameraFeed.contacts)
+            )
+            .execution_options(populate_existing=True)
         )
-        return result.scalar_one()
+        db_obj = result.scalar_one_or_none()
+        await db.commit()
+        active_feeds_cache.invalidate()
+        return db_obj
 
-    async def remove(self, db: AsyncSession, *, id: UUID) -> CameraFeed:
-        """Delete feed"""
-        obj = await self.get(db, id=id)
-        await db.delete(obj)
+    async def remove(self, db: AsyncSession, *, db_obj: CameraFeed) -> CameraFeed:
+        """
+        Delete an already loaded feed with a single DELETE.
+        Child rows are removed by the ON DELETE CASCADE foreign keys.
+        """
+        await db.execute(
+            delete(CameraFeed)
+            .where(CameraFeed.id == db_obj.id)
+            .execution_options(synchronize_session=False)
+        )
         await db.commit()
-        return obj
+        db.expunge(db_obj)
+        active_feeds_cache.invalidate()
+        return db_obj
         
     async def update_settings(
         self, db: AsyncSession, *, feed_id: UUID, obj_in: FeedSettingsUpdate
     ) -> Optional[FeedSettings]:
-        """Update feed settings"""
-        result = await db.execute(select(FeedSettings).where(FeedSettings.feed_id == feed_id))
-        db_obj = result.scalar_one_or_none()
-        
-        if not db_obj:
-            return None
-            
+        """
+        Update feed settings with a single UPDATE ... RETURNING.
+        Returns None if the feed has no settings row.
+        """
         update_data = obj_in.model_dump(exclude_unset=True)
         
         # Handle Enum conversions
         if "sensitivity" in update_data and hasattr(update_data["sensitivity"], "value"):
             update_data["sensitivity"] = update_data["sensitivity"].value
-            
-        for field, value in update_data.items():
-            setattr(db_obj, field, value)
-            
-        db.add(db_obj)
+
+        if not update_data:
+            result = await db.execute(select(FeedSettings).where(FeedSettings.feed_id == feed_id))
+            return result.scalar_one_or_none()
+
+        stmt = (
+            update(FeedSettings)
+            .where(FeedSettings.feed_id == feed_id)
+            .values(**update_data)
+            .returning(FeedSettings)
+        )
+        result = await db.execute(
+            select(FeedSettings)
+            .from_statement(stmt)
+            .execution_options(populate_existing=True)
+        )
+        db_obj = result.scalar_one_or_none()
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
 
 feed = CRUDFeed()
+
+
+class FeedOwnershipLoader:
+    """
+    Per-request, DataLoader-style feed ownership checks.
+
+    Lookups issued in the same event-loop tick are coalesced into a single
+    `id IN (...)` query, and answers are memoised for the rest of the request.
+    """
+
+    def __init__(self, db: AsyncSession, user_id: UUID):
+        self.db = db
+        self.user_id = user_id
+        self._results: Dict[UUID, asyncio.Future] = {}
+        self._pending: List[UUID] = []
+        self._dispatch_task: Optional[asyncio.Task] = None
+
+    async def load(self, feed_id: UUID) -> bool:
+        """Whether the feed exists and belongs to the user"""
+        future = self._results.get(feed_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._results[feed_id] = future
+            self._pending.append(feed_id)
+            if len(self._pending) == 1:
+                # Let the other lookups of this tick queue up before querying
+                loop.call_soon(self._schedule_dispatch)
+        return await future
+
+    async def load_many(self, feed_ids: Iterable[UUID]) -> List[bool]:
+        """Ownership flags for several feeds, in input order"""
+        return list(await asyncio.gather(*(self.load(feed_id) for feed_id in feed_ids)))
+
+    def _schedule_dispatch(self) -> None:
+        self._dispatch_task = asyncio.create_task(self._dispatch())
+
+    async def _dispatch(self) -> None:
+        feed_ids, self._pending = self._pending, []
+        try:
+            owned = await feed.get_owned_ids(self.db, feed_ids=feed_ids, user_id=self.user_id)
+        except Exception as exc:
+            # Forget failed keys so a later load can retry them
+            for feed_id in feed_ids:
+                self._results.pop(feed_id).set_exception(exc)
+            return
+        for feed_id in feed_ids:
+            self._results[feed_id].set_result(feed_id in owned)
@@ -1,13 +1,56 @@
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List, Sequence, Tuple
 from uuid import UUID
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, or_
+from sqlalchemy import select, insert, desc, or_, func, tuple_, Row
 
 from app.models.log import SystemLog
 from app.schemas.log import SystemLogCreate, SystemLogFilter
 
+# SystemLogResponse columns; used by the list and export endpoints
+EXPORT_COLUMNS = (
+    SystemLog.id,
+    SystemLog.source,
+    SystemLog.level,
+    SystemLog.message,
+    SystemLog.details,
+    SystemLog.feed_id,
+    SystemLog.user_id,
+    SystemLog.alert_id,
+    SystemLog.created_at,
+)
+
+
 class CRUDLog:
+    def _apply_filters(self, query, filters: Optional[SystemLogFilter]):
+        """Apply SystemLogFilter criteria to a SystemLog query"""
+        if not filters:
+            return query
+        if filters.source:
+            query = query.where(SystemLog.source == filters.source.value)
+        if filters.level:
+            query = query.where(SystemLog.level == filters.level.value)
+        if filters.feed_id:
+            query = query.where(SystemLog.feed_id == filters.feed_id)
+        if filters.user_id:
+            query = query.where(SystemLog.user_id == filters.user_id)
+        if filters.alert_id:
+            query = query.where(SystemLog.alert_id == filters.alert_id)
+        if filters.start_date:
+            query = query.where(SystemLog.created_at >= filters.start_date)
+        if filters.end_date:
+            query = query.where(SystemLog.created_at <= filters.end_date)
+        if filters.search:
+            # Search in message and details fields
+            search_term = f"%{filters.search}%"
+            query = query.where(
+                or_(
+                    SystemLog.message.ilike(search_term),
+                    SystemLog.details.ilike(search_term)
+                )
+            )
+        return query
+
     async def get(self, db: AsyncSession, id: UUID) -> Optional[SystemLog]:
         """Get log by ID"""
         result = await db.execute(select(SystemLog).where(SystemLog.id == id))
@@ -19,43 +62,132 @@ class CRUDLog:
         *,
         skip: int = 0,
         limit: int = 100,
-        filters: Optional[SystemLogFilter] = None
+        filters: Optional[SystemLogFilter] = None,
+        before_ts: Optional[datetime] = None,
+        before_id: Optional[UUID] = None
     ) -> List[SystemLog]:
-        """Get logs with filtering"""
-        query = select(SystemLog)
-        
-        if filters:
-            if filters.source:
-                query = query.where(SystemLog.source == filters.source.value)
-            if filters.level:
-                query = query.where(SystemLog.level == filters.level.value)
-            if filters.feed_id:
-                query = query.where(SystemLog.feed_id == filters.feed_id)
-            if filters.user_id:
-                query = query.where(SystemLog.user_id == filters.user_id)
-            if filters.alert_id:
-                query = query.where(SystemLog.alert_id == filters.alert_id)
-            if filters.start_date:
-                query = query.where(SystemLog.created_at >= filters.start_date)
-            if filters.end_date:
-                query = query.where(SystemLog.created_at <= filters.end_date)
-            if filters.search:
-                # Search in message and details fields
-                search_term = f"%{filters.search}%"
-                query = query.where(
-                    or_(
-                        SystemLog.message.ilike(search_term),
-                        SystemLog.details.ilike(search_term)
-                    )
-                )
-            
-        # Order by newest first
-        query = query.order_by(desc(SystemLog.created_at))
-        query = query.offset(skip).limit(limit)
-        
+        """
+        Get logs with filtering.
+        Pass the last seen created_at/id as `before_ts`/`before_id` to page
+        without OFFSET; skip is kept for OFFSET-style callers.
+        """
+        query = self._multi_query(
+            select(SystemLog), skip=skip, limit=limit, filters=filters,
+            before_ts=before_ts, before_id=before_id
+        )
         result = await db.execute(query)
         return result.scalars().all()
 
+    async def stream_multi(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[SystemLogFilter] = None,
+        before_ts: Optional[datetime] = None,
+        before_id: Optional[UUID] = None,
+        batch_size: int = 200
+    ) -> AsyncIterator[Row]:
+        """Same as get_multi, but yields plain column rows batch by batch"""
+        query = self._multi_query(
+            select(*EXPORT_COLUMNS), skip=skip, limit=limit, filters=filters,
+            before_ts=before_ts, before_id=before_id
+        ).execution_options(yield_per=batch_size)
+        async for row in await db.stream(query):
+            yield row
+
+    async def list_and_count(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        filters: Optional[SystemLogFilter] = None,
+        before_ts: Optional[datetime] = None,
+        before_id: Optional[UUID] = None
+    ) -> Tuple[List[Row], int]:
+        """
+        One page of log rows plus the total number of logs matching the filters,
+        regardless of the page. COUNT(*) OVER () runs in a subquery over the
+        filtered set and the cursor/OFFSET/LIMIT are applied outside it; an
+        empty page (e.g. past the end) falls back to a plain COUNT.
+        """
+        filtered = self._apply_filters(select(*EXPORT_COLUMNS), filters)
+        counted = filtered.add_columns(func.count().over().label("total")).subquery()
+        query = self._page(
+            select(counted), counted.c,
+            skip=skip, limit=limit, before_ts=before_ts, before_id=before_id
+        )
+        rows = (await db.execute(query)).all()
+        if rows:
+            return rows, rows[0].total
+        total = await db.scalar(select(func.count()).select_from(filtered.subquery()))
+        return rows, total
+
+    def _multi_query(
+        self,
+        query,
+        *,
+        skip: int,
+        limit: int,
+        filters: Optional[SystemLogFilter],
+        before_ts: Optional[datetime],
+        before_id: Optional[UUID]
+    ):
+        """Apply filters, keyset cursor, newest-first order and paging to query"""
+        return self._page(
+            self._apply_filters(query, filters), SystemLog,
+            skip=skip, limit=limit, before_ts=before_ts, before_id=before_id
+        )
+
+    @staticmethod
+    def _page(
+        query,
+        columns,
+        *,
+        skip: int,
+        limit: int,
+        before_ts: Optional[datetime],
+        before_id: Optional[UUID]
+    ):
+        """
+        Apply the keyset cursor, newest-first order and paging to query.
+        columns is SystemLog or a subquery's .c; it must expose created_at and id.
+        """
+        if before_ts and before_id:
+            query = query.where(tuple_(columns.created_at, columns.id) < tuple_(before_ts, before_id))
+        elif before_ts:
+            query = query.where(columns.created_at < before_ts)
+
+        # Order by newest first; id breaks ties so keyset pages are stable
+        query = query.order_by(desc(columns.created_at), desc(columns.id))
+        if skip:
+            query = query.offset(skip)
+        return query.limit(limit)
+
+    async def stream_export_rows(
+        self,
+        db: AsyncSession,
+        *,
+        limit: int = 10000,
+        filters: Optional[SystemLogFilter] = None,
+        batch_size: int = 500
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Stream the export columns of matching logs, newest first.
+        Yields lists of up to batch_size rows so callers never hold the full set.
+        """
+        query = self._apply_filters(select(*EXPORT_COLUMNS), filters)
+        query = (
+            query.order_by(desc(SystemLog.created_at))
+            .limit(limit)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await db.stream(query)
+        async for partition in result.partitions():
+            yield partition
+
     async def create(self, db: AsyncSession, *, obj_in: SystemLogCreate) -> SystemLog:
         """Create new log entry"""
         db_obj = SystemLog(
@@ -69,9 +201,32 @@ class CRUDLog:
         )
         db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
 
+    async def create_many(self, db: AsyncSession, *, objs_in: List[SystemLogCreate]) -> None:
+        """
+        Insert a burst of log entries with one Core executemany and one commit.
+        Nothing is returned, so no ORM objects are built.
+        """
+        if not objs_in:
+            return
+        await db.execute(
+            insert(SystemLog),
+            [
+                {
+                    "source": obj_in.source.value,
+                    "level": obj_in.level.value,
+                    "feed_id": obj_in.feed_id,
+                    "user_id": obj_in.user_id,
+                    "alert_id": obj_in.alert_id,
+                    "message": obj_in.message,
+                    "details": obj_in.details,
+                }
+                for obj_in in objs_in
+            ]
+        )
+        await db.commit()
+
     async def count(
         self,
         db: AsyncSession,
@@ -79,33 +234,7 @@ class CRUDLog:
         filters: Optional[SystemLogFilter] = None
     ) -> int:
         """Count logs matching filters"""
-        query = select(SystemLog)
-        
-        if filters:
-            if filters.source:
-                query = query.where(SystemLog.source == filters.source.value)
-            if filters.level:
-                query = query.where(SystemLog.level == filters.level.value)
-            if filters.feed_id:
-                query = query.where(SystemLog.feed_id == filters.feed_id)
-            if filters.user_id:
-                query = query.where(SystemLog.user_id == filters.user_id)
-            if filters.alert_id:
-                query = query.where(SystemLog.alert_id == filters.alert_id)
-            if filters.start_date:
-                query = query.where(SystemLog.created_at >= filters.start_date)
-            if filters.end_date:
-                query = query.where(SystemLog.created_at <= filters.end_date)
-            if filters.search:
-                search_term = f"%{filters.search}%"
-                query = query.where(
-                    or_(
-                        SystemLog.message.ilike(search_term),
-                        SystemLog.details.ilike(search_term)
-                    )
-                )
-        
-        result = await db.execute(query)
-        return len(result.scalars().all())
+        query = self._apply_filters(select(func.count()).select_from(SystemLog), filters)
+        return await db.scalar(query)
 
 log = CRUDLog()
@@ -1,17 +1,49 @@
 from typing import Optional, List
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash
+from app.core.cache import TTLCache
+from app.core.security import get_password_hash_async
+
+# Column snapshots of recently authenticated users, keyed by user id
+user_cache = TTLCache(ttl=30, maxsize=50_000)
+
+# Fixed-shape lookups built once; executing them skips statement construction
+_USER_BY_ID = select(User).where(User.id == bindparam("id"))
+_USER_COLUMNS_BY_ID = select(*User.__table__.columns).where(User.id == bindparam("id"))
+
 
 class CRUDUser:
     async def get(self, db: AsyncSession, id: UUID) -> Optional[User]:
         """Get user by ID"""
-        result = await db.execute(select(User).where(User.id == id))
+        result = await db.execute(_USER_BY_ID, {"id": id})
         return result.scalar_one_or_none()
 
+    async def get_cached(self, db: AsyncSession, id: UUID) -> Optional[User]:
+        """
+        Get user by ID, answering repeat lookups from a short-lived cache.
+        The cached row is attached to `db` without SQL, so callers get a normal
+        session-bound User they can update.
+        """
+        columns = await user_cache.get_or_set(id, lambda: self._load_columns(db, id))
+        if columns is None:
+            return None
+
+        db_obj = User()
+        for key, value in columns.items():
+            set_committed_value(db_obj, key, value)
+        make_transient_to_detached(db_obj)
+        return await db.merge(db_obj, load=False)
+
+    async def _load_columns(self, db: AsyncSession, id: UUID) -> Optional[dict]:
+        result = await db.execute(_USER_COLUMNS_BY_ID, {"id": id})
+        row = result.mappings().one_or_none()
+        return dict(row) if row else None
+
     async def get_by_email(self, db: AsyncSession, email: str) -> Optional[User]:
         """Get user by email"""
         result = await db.execute(select(User).where(User.email == email))
@@ -19,9 +51,7 @@ class CRUDUser:
 
     async def create(self, db: AsyncSession, obj_in: UserCreate) -> User:
         """Create new user"""
-        print(obj_in.model_dump_json())
-        password_hash = get_password_hash(obj_in.password)
-        print(password_hash)
+        password_hash = await get_password_hash_async(obj_in.password)
         db_obj = User(
             email=str(obj_in.email),
             name=obj_in.name,
@@ -32,7 +62,6 @@ class CRUDUser:
         )
         db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
 
     async def update(
@@ -45,16 +74,28 @@ class CRUDUser:
             update_data = obj_in.model_dump(exclude_unset=True)
 
         if "password" in update_data:
-            hashed_password = get_password_hash(update_data["password"])
+            hashed_password = await get_password_hash_async(update_data["password"])
             del update_data["password"]
             update_data["password_hash"] = hashed_password
 
-        for field, value in update_data.items():
-            setattr(db_obj, field, value)
+        if not update_data:
+            return db_obj
 
-        db.add(db_obj)
+        # One UPDATE ... RETURNING; the new values are then set as committed
+        # state, so the (possibly detached, cached) user needs no flush
+        updated_at = (
+            await db.execute(
+                update(User)
+                .where(User.id == db_obj.id)
+                .values(**update_data)
+                .returning(User.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+        ).scalar_one()
         await db.commit()
-        await db.refresh(db_obj)
+        for field, value in {**update_data, "updated_at": updated_at}.items():
+            set_committed_value(db_obj, field, value)
+        user_cache.pop(db_obj.id)
         return db_obj
 
 user = CRUDUser()
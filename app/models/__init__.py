@@ -4,7 +4,7 @@ from app.models.user import User
 from app.models.feed import CameraFeed, FeedSettings
 from app.models.contact import AlertContact
 from app.models.alert import Alert, AlertAIAnalysis, AlertAction
-from app.models.analytics import SystemMetric, Detection, AgentSession
+from app.models.analytics import SystemMetric, Detection, AgentSession, DailyStat
 from app.models.log import SystemLog
 
 __all__ = [
@@ -18,5 +18,6 @@ __all__ = [
     "Detection",
     "AgentSession",
     "SystemMetric",
+    "DailyStat",
     "SystemLog",
 ]
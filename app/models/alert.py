@@ -1,6 +1,6 @@
 import uuid
-from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, Enum, Text, DateTime, Float, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, Enum, Text, DateTime, Float, Index
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -29,13 +29,15 @@ class AlertType(str, enum.Enum):
 class Alert(Base):
     """Alert model"""
     __tablename__ = "alerts"
+    # CRUDAlert.resolve changes the row through the ORM; RETURNING hands back updated_at
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    feed_id = Column(UUID(as_uuid=True), ForeignKey("camera_feeds.id"), nullable=False)
+    feed_id = Column(UUID(as_uuid=True), ForeignKey("camera_feeds.id", ondelete="CASCADE"), nullable=False)
     
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
-    status = Column(String(20), default=AlertStatus.ACTIVE.value, index=True)
+    status = Column(String(20), default=AlertStatus.ACTIVE.value)
     severity = Column(String(20), default=AlertSeverity.MEDIUM.value, index=True)
     alert_type = Column(String(50), default=AlertType.OTHER.value)
     
@@ -52,12 +54,22 @@ class Alert(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
     # Relationships
-    feed = relationship("CameraFeed", back_populates="alerts")
-    resolver = relationship("User", backref="resolved_alerts")
-    ai_analysis = relationship("AlertAIAnalysis", back_populates="alert", uselist=False, cascade="all, delete-orphan")
-    actions = relationship("AlertAction", back_populates="alert", cascade="all, delete-orphan")
-    related_detections = relationship("Detection", back_populates="alert", cascade="all, delete-orphan")
-    logs = relationship("SystemLog", back_populates="alert", cascade="all, delete-orphan")
+    feed = relationship("CameraFeed", back_populates="alerts", lazy="raise")
+    resolver = relationship("User", back_populates="resolved_alerts", lazy="raise")
+    ai_analysis = relationship("AlertAIAnalysis", back_populates="alert", uselist=False, cascade="all, delete-orphan", lazy="raise", passive_deletes=True)
+    actions = relationship("AlertAction", back_populates="alert", cascade="all, delete-orphan", lazy="raise", passive_deletes=True)
+    related_detections = relationship("Detection", back_populates="alert", cascade="all, delete-orphan", lazy="raise", passive_deletes=True)
+    logs = relationship("SystemLog", back_populates="alert", cascade="all, delete-orphan", lazy="raise", passive_deletes=True)
+
+    # Composite indexes
+    __table_args__ = (
+        Index('ix_alerts_created_id', created_at.desc(), id.desc()),
+        # Leading feed_id also serves plain feed lookups and the FK cascade
+        Index('ix_alerts_feed_created', 'feed_id', created_at.desc()),
+        Index('ix_alerts_feed_status_created', 'feed_id', 'status', created_at.desc()),
+        # Active alerts are a small slice; replaces the low-cardinality status index
+        Index('ix_alerts_active_feed_created', 'feed_id', created_at.desc(), postgresql_where=(status == AlertStatus.ACTIVE.value)),
+    )
 
     def __repr__(self):
         return f"<Alert(id={self.id}, title='{self.title}', severity='{self.severity}')>"
@@ -68,18 +80,18 @@ class AlertAIAnalysis(Base):
     __tablename__ = "alert_ai_analysis"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    alert_id = Column(UUID(as_uuid=True), ForeignKey("alerts.id"), unique=True, nullable=False)
+    alert_id = Column(UUID(as_uuid=True), ForeignKey("alerts.id", ondelete="CASCADE"), unique=True, nullable=False)
     
     confidence_score = Column(Float, nullable=False)
-    detected_objects = Column(JSON, default=list)  # List of objects detected
+    detected_objects = Column(JSONB, default=list)  # List of objects detected
     scene_description = Column(Text, nullable=True)
-    risk_factors = Column(JSON, default=list)  # List of risk factors identified
-    recommendations = Column(JSON, default=list)  # List of recommended actions
+    risk_factors = Column(JSONB, default=list)  # List of risk factors identified
+    recommendations = Column(JSONB, default=list)  # List of recommended actions
     
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     # Relationships
-    alert = relationship("Alert", back_populates="ai_analysis")
+    alert = relationship("Alert", back_populates="ai_analysis", lazy="raise")
 
     def __repr__(self):
         return f"<AlertAIAnalysis(alert_id={self.alert_id}, confidence={self.confidence_score})>"
@@ -90,7 +102,7 @@ class AlertAction(Base):
     __tablename__ = "alert_actions"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    alert_id = Column(UUID(as_uuid=True), ForeignKey("alerts.id"), nullable=False)
+    alert_id = Column(UUID(as_uuid=True), ForeignKey("alerts.id", ondelete="CASCADE"), nullable=False)
     
     action_type = Column(String(50), nullable=False)  # sms, call, email, push
     recipient = Column(String(255), nullable=False)
@@ -100,7 +112,12 @@ class AlertAction(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     # Relationships
-    alert = relationship("Alert", back_populates="actions")
+    alert = relationship("Alert", back_populates="actions", lazy="raise")
+
+    # Composite indexes
+    __table_args__ = (
+        Index('ix_alert_actions_type_created', 'action_type', created_at.desc()),
+    )
 
     def __repr__(self):
         return f"<AlertAction(id={self.id}, type='{self.action_type}', status='{self.status}')>"
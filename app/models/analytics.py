@@ -1,6 +1,6 @@
 import uuid
-from sqlalchemy import Column, String, Integer, Float, ForeignKey, DateTime, JSON
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, DateTime, Date, Index
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -16,10 +16,16 @@ class SystemMetric(Base):
     active_feeds = Column(Integer, default=0)
     active_agents = Column(Integer, default=0)
     
-    feed_id = Column(UUID(as_uuid=True), ForeignKey("camera_feeds.id"), nullable=True, index=True)
+    feed_id = Column(UUID(as_uuid=True), ForeignKey("camera_feeds.id", ondelete="CASCADE"), nullable=True)
     
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
 
+    # Composite indexes
+    __table_args__ = (
+        # Leading feed_id also serves plain feed lookups and the FK cascade
+        Index('ix_system_metrics_feed_created', 'feed_id', created_at.desc()),
+    )
+
     def __repr__(self):
         return f"<SystemMetric(id={self.id})>"
 
@@ -29,15 +35,15 @@ class Detection(Base):
     __tablename__ = "detections"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    feed_id = Column(UUID(as_uuid=True), ForeignKey("camera_feeds.id"), nullable=False, index=True)
-    alert_id = Column(UUID(as_uuid=True), ForeignKey("alerts.id"), nullable=True)
+    feed_id = Column(UUID(as_uuid=True), ForeignKey("camera_feeds.id", ondelete="CASCADE"), nullable=False)
+    alert_id = Column(UUID(as_uuid=True), ForeignKey("alerts.id", ondelete="CASCADE"), nullable=True)
     
     # Detection details
     detection_type = Column(String(100), nullable=False)  # e.g., "high", "medium", "low" (formerly risk_level)
     confidence = Column(Float, nullable=False)  # 0.0 to 1.0
     description = Column(String(1000), nullable=True)  # Human-readable description
-    context_tags = Column(JSON, nullable=True)  # List of tags e.g. ["human_presence", "idle_activity"]
-    bounding_box = Column(JSON, nullable=True)  # {"x": 100, "y": 200, "width": 50, "height": 100}
+    context_tags = Column(JSONB, nullable=True)  # List of tags e.g. ["human_presence", "idle_activity"]
+    bounding_box = Column(JSONB, nullable=True)  # {"x": 100, "y": 200, "width": 50, "height": 100}
     # metadata_ = Column(JSON, nullable=True)  # Deprecated
     
     # Frame information
@@ -49,8 +55,16 @@ class Detection(Base):
     feedback_comment = Column(String(1000), nullable=True)
 
     # Relationships
-    feed = relationship("CameraFeed", back_populates="detections")
-    alert = relationship("Alert", back_populates="related_detections")
+    feed = relationship("CameraFeed", back_populates="detections", lazy="raise")
+    alert = relationship("Alert", back_populates="related_detections", lazy="raise")
+
+    # Composite indexes
+    __table_args__ = (
+        # Leading feed_id also serves plain feed lookups and the FK cascade
+        Index('ix_detections_feed_timestamp', 'feed_id', timestamp.desc()),
+        # Containment (@>) lookups on tags, e.g. context_tags @> '["human_presence"]'
+        Index('ix_detections_context_tags', 'context_tags', postgresql_using='gin', postgresql_ops={'context_tags': 'jsonb_path_ops'}),
+    )
 
     def __repr__(self):
         return f"<Detection(id={self.id}, type='{self.detection_type}', confidence={self.confidence})>"
@@ -61,7 +75,7 @@ class AgentSession(Base):
     __tablename__ = "agent_sessions"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    feed_id = Column(UUID(as_uuid=True), ForeignKey("camera_feeds.id"), nullable=False, index=True)
+    feed_id = Column(UUID(as_uuid=True), ForeignKey("camera_feeds.id", ondelete="CASCADE"), nullable=False, index=True)
     
     # Session details
     agent_version = Column(String(50), nullable=True)
@@ -79,7 +93,27 @@ class AgentSession(Base):
     ended_at = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
-    feed = relationship("CameraFeed", back_populates="agent_sessions")
+    feed = relationship("CameraFeed", back_populates="agent_sessions", lazy="raise")
+
+    # Composite indexes
+    __table_args__ = (
+        Index('ix_agent_sessions_active_feed', 'feed_id', started_at.desc(), postgresql_where=(status == "active")),
+    )
 
     def __repr__(self):
         return f"<AgentSession(id={self.id}, feed_id={self.feed_id}, status='{self.status}')>"
+
+
+class DailyStat(Base):
+    """Per-feed daily rollup of dashboard counters, upserted on write"""
+    __tablename__ = "daily_stats"
+
+    day = Column(Date, primary_key=True)  # UTC date
+    feed_id = Column(UUID(as_uuid=True), ForeignKey("camera_feeds.id", ondelete="CASCADE"), primary_key=True)
+
+    calls = Column(Integer, nullable=False, default=0, server_default="0")
+    sms = Column(Integer, nullable=False, default=0, server_default="0")
+    detections = Column(Integer, nullable=False, default=0, server_default="0")
+
+    def __repr__(self):
+        return f"<DailyStat(day={self.day}, feed_id={self.feed_id})>"
@@ -8,9 +8,11 @@ from app.core.database import Base
 class AlertContact(Base):
     """Alert Contact model"""
     __tablename__ = "alert_contacts"
+    # CRUDContact.update flushes through the ORM; RETURNING hands back updated_at
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    feed_id = Column(UUID(as_uuid=True), ForeignKey("camera_feeds.id"), nullable=False)
+    feed_id = Column(UUID(as_uuid=True), ForeignKey("camera_feeds.id", ondelete="CASCADE"), nullable=False)
     
     name = Column(String(255), nullable=False)
     phone = Column(String(50), nullable=True)
@@ -21,7 +23,7 @@ class AlertContact(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
     # Relationships
-    feed = relationship("CameraFeed", back_populates="contacts")
+    feed = relationship("CameraFeed", back_populates="contacts", lazy="raise")
 
     def __repr__(self):
         return f"<AlertContact(id={self.id}, name='{self.name}', feed_id={self.feed_id})>"
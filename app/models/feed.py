@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, Enum, Text, DateTime, Float
+from sqlalchemy import Column, String, Boolean, Integer, ForeignKey, Enum, Text, DateTime, Float, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -26,9 +26,11 @@ class SensitivityLevel(str, enum.Enum):
 class CameraFeed(Base):
     """Camera Feed model"""
     __tablename__ = "camera_feeds"
+    # create_with_owner gets created_at/updated_at from INSERT ... RETURNING
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     name = Column(String(255), nullable=False)
     feed_url = Column(String(1024), nullable=False)
     location = Column(String(255), nullable=False)
@@ -46,13 +48,18 @@ class CameraFeed(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
     # Relationships
-    user = relationship("User", backref="feeds")
-    settings = relationship("FeedSettings", back_populates="feed", uselist=False, cascade="all, delete-orphan")
-    contacts = relationship("AlertContact", back_populates="feed", cascade="all, delete-orphan")
-    alerts = relationship("Alert", back_populates="feed", cascade="all, delete-orphan")
-    detections = relationship("Detection", back_populates="feed", cascade="all, delete-orphan")
-    agent_sessions = relationship("AgentSession", back_populates="feed", cascade="all, delete-orphan")
-    logs = relationship("SystemLog", back_populates="feed", cascade="all, delete-orphan")
+    user = relationship("User", back_populates="feeds", lazy="raise")
+    settings = relationship("FeedSettings", back_populates="feed", uselist=False, cascade="all, delete-orphan", lazy="raise", passive_deletes=True)
+    contacts = relationship("AlertContact", back_populates="feed", cascade="all, delete-orphan", lazy="raise", passive_deletes=True)
+    alerts = relationship("Alert", back_populates="feed", cascade="all, delete-orphan", lazy="raise", passive_deletes=True)
+    detections = relationship("Detection", back_populates="feed", cascade="all, delete-orphan", lazy="raise", passive_deletes=True)
+    agent_sessions = relationship("AgentSession", back_populates="feed", cascade="all, delete-orphan", lazy="raise", passive_deletes=True)
+    logs = relationship("SystemLog", back_populates="feed", cascade="all, delete-orphan", lazy="raise", passive_deletes=True)
+
+    __table_args__ = (
+        # The agent polls the few active feeds; keeps that lookup off the full table
+        Index('ix_camera_feeds_active', 'id', postgresql_where=(status == FeedStatus.ACTIVE.value)),
+    )
 
     def __repr__(self):
         return f"<CameraFeed(id={self.id}, name='{self.name}', status='{self.status}')>"
@@ -61,9 +68,11 @@ class CameraFeed(Base):
 class FeedSettings(Base):
     """Settings for a specific camera feed"""
     __tablename__ = "feed_settings"
+    # Inserted alongside its feed; the server-side timestamps come back via RETURNING
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    feed_id = Column(UUID(as_uuid=True), ForeignKey("camera_feeds.id"), unique=True, nullable=False)
+    feed_id = Column(UUID(as_uuid=True), ForeignKey("camera_feeds.id", ondelete="CASCADE"), unique=True, nullable=False)
     
     # Notifications
     push_enabled = Column(Boolean, default=True)
@@ -80,7 +89,7 @@ class FeedSettings(Base):
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
     # Relationships
-    feed = relationship("CameraFeed", back_populates="settings")
+    feed = relationship("CameraFeed", back_populates="settings", lazy="raise")
 
     def __repr__(self):
         return f"<FeedSettings(feed_id={self.feed_id})>"
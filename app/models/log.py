@@ -30,25 +30,35 @@ class SystemLog(Base):
     level = Column(String(20), default=LogLevel.INFO.value, index=True)
     
     # Optional associations
-    feed_id = Column(UUID(as_uuid=True), ForeignKey("camera_feeds.id"), nullable=True)
+    feed_id = Column(UUID(as_uuid=True), ForeignKey("camera_feeds.id", ondelete="CASCADE"), nullable=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=True)
-    alert_id = Column(UUID(as_uuid=True), ForeignKey("alerts.id"), nullable=True)
+    alert_id = Column(UUID(as_uuid=True), ForeignKey("alerts.id", ondelete="CASCADE"), nullable=True)
     
     # Log content
     message = Column(Text, nullable=False)
     details = Column(Text, nullable=True)  # Additional context or stack trace
     
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     # Relationships
-    feed = relationship("CameraFeed", back_populates="logs")
-    user = relationship("User", backref="logs")
-    alert = relationship("Alert", back_populates="logs")
+    feed = relationship("CameraFeed", back_populates="logs", lazy="raise")
+    user = relationship("User", back_populates="logs", lazy="raise")
+    alert = relationship("Alert", back_populates="logs", lazy="raise")
 
     # Composite indexes
     __table_args__ = (
-        Index('ix_logs_source_level', 'source', 'level'),
+        Index('ix_logs_source_level_created', 'source', 'level', created_at.desc()),
         Index('ix_logs_created_source', 'created_at', 'source'),
+        # Logs are append-only, so created_at follows physical order; BRIN covers
+        # time-range scans at a fraction of a btree's size (ordering uses the index above)
+        Index('ix_logs_created_brin', 'created_at', postgresql_using='brin', postgresql_with={'pages_per_range': 32}),
+        # Per-entity newest-first listing; partial since most logs carry no link
+        Index('ix_logs_feed_created', 'feed_id', created_at.desc(), postgresql_where=feed_id.isnot(None)),
+        Index('ix_logs_user_created', 'user_id', created_at.desc(), postgresql_where=user_id.isnot(None)),
+        Index('ix_logs_alert_created', 'alert_id', created_at.desc(), postgresql_where=alert_id.isnot(None)),
+        # Trigram indexes back the ILIKE '%...%' search
+        Index('ix_logs_message_trgm', 'message', postgresql_using='gin', postgresql_ops={'message': 'gin_trgm_ops'}),
+        Index('ix_logs_details_trgm', 'details', postgresql_using='gin', postgresql_ops={'details': 'gin_trgm_ops'}),
     )
 
     def __repr__(self):
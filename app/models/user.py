@@ -1,6 +1,7 @@
 import uuid
 from sqlalchemy import Column, String, Boolean, DateTime
 from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -9,6 +10,8 @@ class User(Base):
     """User model for XMonitor API"""
 
     __tablename__ = "users"
+    # CRUDUser.create gets created_at/updated_at from INSERT ... RETURNING
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     email = Column(String(255), unique=True, index=True, nullable=False)
@@ -22,6 +25,11 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
+    # Relationships
+    feeds = relationship("CameraFeed", back_populates="user", lazy="raise")
+    logs = relationship("SystemLog", back_populates="user", lazy="raise")
+    resolved_alerts = relationship("Alert", back_populates="resolver", lazy="raise")
+
     def __repr__(self):
         return f"<User(id={self.id}, email='{self.email}', name='{self.name}')>"
 
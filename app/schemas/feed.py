@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, ConfigDict, HttpUrl, field_validator
-from typing import Optional, List, Union
+from pydantic import BaseModel, Field, ConfigDict, HttpUrl
+from typing import Optional, List
 from datetime import datetime
 from uuid import UUID
 from enum import Enum
@@ -23,6 +23,13 @@ class SensitivityLevel(str, Enum):
     MEDIUM = "medium"
     HIGH = "high"
 
+    @classmethod
+    def _missing_(cls, value):
+        """Match case-insensitively; unknown strings fall back to MEDIUM"""
+        if isinstance(value, str):
+            return cls._value2member_map_.get(value.lower(), cls.MEDIUM)
+        return None
+
 from app.schemas.contact import AlertContactResponse
 
 
@@ -32,21 +39,11 @@ class FeedSettingsBase(BaseModel):
     email_enabled: bool = False
     sms_enabled: bool = False
     sound_enabled: bool = True
-    sensitivity: Union[SensitivityLevel, str] = SensitivityLevel.MEDIUM
+    # Strings are coerced by the enum itself, see SensitivityLevel._missing_
+    sensitivity: SensitivityLevel = SensitivityLevel.MEDIUM
     auto_record: bool = True
     record_duration: int = Field(30, ge=5, le=300)  # 5s to 5min
 
-    @field_validator('sensitivity', mode='before')
-    @classmethod
-    def convert_sensitivity(cls, v):
-        """Convert string sensitivity to enum if needed"""
-        if isinstance(v, str):
-            try:
-                return SensitivityLevel(v.lower())
-            except ValueError:
-                return SensitivityLevel.MEDIUM
-        return v
-
 
 class FeedSettingsCreate(FeedSettingsBase):
     pass
@@ -57,23 +54,10 @@ class FeedSettingsUpdate(BaseModel):
     email_enabled: Optional[bool] = None
     sms_enabled: Optional[bool] = None
     sound_enabled: Optional[bool] = None
-    sensitivity: Optional[Union[SensitivityLevel, str]] = None
+    sensitivity: Optional[SensitivityLevel] = None
     auto_record: Optional[bool] = None
     record_duration: Optional[int] = Field(None, ge=5, le=300)
 
-    @field_validator('sensitivity', mode='before')
-    @classmethod
-    def convert_sensitivity(cls, v):
-        """Convert string sensitivity to enum if needed"""
-        if v is None:
-            return v
-        if isinstance(v, str):
-            try:
-                return SensitivityLevel(v.lower())
-            except ValueError:
-                return SensitivityLevel.MEDIUM
-        return v
-
 
 class FeedSettingsResponse(FeedSettingsBase):
     id: UUID
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import uuid
 from typing import Optional
@@ -8,6 +9,14 @@ import cloudinary
 import cloudinary.uploader
 from app.core.config import settings
 
+# Bytes read from an upload per write when saving locally
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds settings.MAX_UPLOAD_SIZE"""
+
+
 class MediaService:
     def __init__(self):
         self.upload_dir = Path(settings.UPLOAD_DIR)
@@ -38,10 +47,21 @@ class MediaService:
         
         file_path = save_dir / unique_filename
         
-        # Save file
-        async with aiofiles.open(file_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
+        # Save file chunk by chunk so large videos never sit fully in memory;
+        # stop and remove the partial file once the size limit is passed
+        written = 0
+        try:
+            async with aiofiles.open(file_path, 'wb') as f:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    written += len(chunk)
+                    if written > settings.MAX_UPLOAD_SIZE:
+                        raise UploadTooLargeError(
+                            f"File too large. Max size: {settings.MAX_UPLOAD_SIZE} bytes"
+                        )
+                    await f.write(chunk)
+        except BaseException:
+            file_path.unlink(missing_ok=True)
+            raise
         
         # Generate URL (relative path for serving)
         file_url = f"/media/{subfolder}/{unique_filename}" if subfolder else f"/media/{unique_filename}"
@@ -62,12 +82,12 @@ class MediaService:
         if not settings.cloudinary_enabled:
             raise Exception("Cloudinary is not configured")
         
-        # Read file content
-        content = await file.read()
-        
-        # Upload to Cloudinary
-        result = cloudinary.uploader.upload(
-            content,
+        # The SDK is blocking; run it in a thread and hand it the spooled
+        # upload file directly instead of reading it into memory first
+        await file.seek(0)
+        result = await asyncio.to_thread(
+            cloudinary.uploader.upload,
+            file.file,
             resource_type=resource_type,
             folder="xmonitor"
         )
@@ -94,6 +114,12 @@ class MediaService:
         Returns:
             dict: {"url": str, "storage": "local" or "cloudinary"}
         """
+        # The parsed upload's size is known here; don't ship oversized files anywhere
+        if file.size is not None and file.size > settings.MAX_UPLOAD_SIZE:
+            raise UploadTooLargeError(
+                f"File too large. Max size: {settings.MAX_UPLOAD_SIZE} bytes"
+            )
+
         # Determine storage method
         if use_cloudinary is None:
             use_cloudinary = settings.cloudinary_enabled
@@ -128,10 +154,10 @@ class MediaService:
             Path object or None if not found
         """
         # Remove /media/ prefix
-        relative_path = file_url.replace("/media/", "")
+        relative_path = file_url.removeprefix("/media/")
         file_path = self.upload_dir / relative_path
         
-        if file_path.exists():
+        if file_path.is_file():
             return file_path
         return None
 
@@ -1,10 +1,14 @@
-from typing import Dict, Set
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Set, Tuple
 from fastapi import WebSocket
 from uuid import UUID
-import json
+import orjson
 import redis.asyncio as redis
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 class ConnectionManager:
     def __init__(self):
         # Active WebSocket connections by user_id
@@ -12,6 +16,14 @@ class ConnectionManager:
         # Redis pub/sub for scaling across multiple instances
         self.redis_client: redis.Redis = None
         self.pubsub = None
+        # Admission control: a plain counter guarded by a Condition, so the
+        # limit can be changed at runtime (unlike a Semaphore's fixed value)
+        self.max_connections = settings.WS_MAX_CONNECTIONS
+        self._admitted = 0
+        self._admission = asyncio.Condition()
+        # Locally broadcast events are coalesced by a background drain task
+        self._events: asyncio.Queue = None
+        self._drain_task: asyncio.Task = None
     
     async def connect_redis(self):
         """Initialize Redis connection for pub/sub"""
@@ -27,14 +39,45 @@ class ConnectionManager:
             print(f"Redis connection failed: {e}")
             self.redis_client = None
     
-    async def connect(self, websocket: WebSocket, user_id: str):
-        """Connect a new WebSocket client"""
-        await websocket.accept()
+    async def set_max_connections(self, limit: int):
+        """Change the connection limit; waiting clients are re-checked at once"""
+        async with self._admission:
+            self.max_connections = limit
+            self._admission.notify_all()
+    
+    async def release(self):
+        """Give back the admission slot taken by a successful connect()"""
+        async with self._admission:
+            self._admitted -= 1
+            self._admission.notify(1)
+    
+    async def connect(self, websocket: WebSocket, user_id: str) -> bool:
+        """
+        Connect a new WebSocket client.
+        Waits up to WS_ADMISSION_TIMEOUT for a free slot and returns False if
+        none frees up; on True the caller must call release() when done.
+        """
+        async with self._admission:
+            try:
+                await asyncio.wait_for(
+                    self._admission.wait_for(lambda: self._admitted < self.max_connections),
+                    timeout=settings.WS_ADMISSION_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                return False
+            self._admitted += 1
+        
+        try:
+            await websocket.accept()
+        except Exception:
+            await self.release()
+            raise
         
         if user_id not in self.active_connections:
             self.active_connections[user_id] = set()
         
         self.active_connections[user_id].add(websocket)
+        return True
     
     def disconnect(self, websocket: WebSocket, user_id: str):
         """Disconnect a WebSocket client"""
@@ -45,52 +88,84 @@ class ConnectionManager:
             if not self.active_connections[user_id]:
                 del self.active_connections[user_id]
     
+    async def _send_text(self, targets: Iterable[Tuple[str, WebSocket]], payload: str):
+        """
+        Send an already serialized message to many sockets concurrently.
+        A failing socket does not hold up the others; failures are pruned afterwards.
+        """
+        targets = list(targets)
+        results = await asyncio.gather(
+            *(connection.send_text(payload) for _, connection in targets),
+            return_exceptions=True
+        )
+        
+        # Clean up disconnected connections
+        for (user_id, connection), result in zip(targets, results):
+            if isinstance(result, Exception):
+                self.disconnect(connection, user_id)
+    
     async def send_personal_message(self, message: dict, user_id: str):
         """Send message to all connections of a specific user"""
         if user_id in self.active_connections:
-            disconnected = set()
-            for connection in self.active_connections[user_id]:
-                try:
-                    await connection.send_json(message)
-                except Exception:
-                    disconnected.add(connection)
-            
-            # Clean up disconnected connections
-            for conn in disconnected:
-                self.active_connections[user_id].discard(conn)
+            payload = orjson.dumps(message).decode()
+            await self._send_text(
+                ((user_id, connection) for connection in self.active_connections[user_id]),
+                payload
+            )
+    
+    async def _broadcast_text(self, payload: str):
+        """Send a serialized message to every connected client"""
+        targets: List[Tuple[str, WebSocket]] = [
+            (user_id, connection)
+            for user_id, connections in self.active_connections.items()
+            for connection in connections
+        ]
+        await self._send_text(targets, payload)
     
     async def broadcast(self, message: dict):
         """Broadcast message to all connected clients"""
-        disconnected = []
-        for user_id, connections in self.active_connections.items():
-            for connection in connections:
-                try:
-                    await connection.send_json(message)
-                except Exception:
-                    disconnected.append((user_id, connection))
-        
-        # Clean up disconnected connections
-        for user_id, conn in disconnected:
-            if user_id in self.active_connections:
-                self.active_connections[user_id].discard(conn)
+        # Serialize once, not once per connection
+        await self._broadcast_text(orjson.dumps(message).decode())
+    
+    async def _drain_events(self):
+        """
+        Fan out queued events in batches.
+        After the first event arrives, wait WS_BATCH_WINDOW_MS for more, then
+        send everything collected as one frame: a lone event is sent as-is,
+        several go out as {"type": "batch", "events": [...]}.
+        """
+        window = settings.WS_BATCH_WINDOW_MS / 1000
+        while True:
+            events = [await self._events.get()]
+            if window:
+                await asyncio.sleep(window)
+            while not self._events.empty():
+                events.append(self._events.get_nowait())
+            
+            message = events[0] if len(events) == 1 else {"type": "batch", "events": events}
+            try:
+                await self._broadcast_text(orjson.dumps(message).decode())
+            except Exception:
+                logger.exception("Failed to broadcast events")
     
     async def publish_event(self, event_type: str, data: dict):
         """Publish event to Redis for cross-instance broadcasting"""
+        event = {
+            "type": event_type,
+            "data": data
+        }
+        
         if self.redis_client:
             try:
-                message = json.dumps({
-                    "type": event_type,
-                    "data": data
-                })
-                await self.redis_client.publish("xmonitor_events", message)
+                await self.redis_client.publish("xmonitor_events", orjson.dumps(event).decode())
             except Exception as e:
                 print(f"Failed to publish to Redis: {e}")
         
-        # Also broadcast locally
-        await self.broadcast({
-            "type": event_type,
-            "data": data
-        })
+        # Also broadcast locally, coalesced with other events from the same burst
+        if self._drain_task is None or self._drain_task.done():
+            self._events = asyncio.Queue()
+            self._drain_task = asyncio.create_task(self._drain_events())
+        self._events.put_nowait(event)
 
 # Global connection manager instance
 manager = ConnectionManager()
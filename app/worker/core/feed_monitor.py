@@ -3,6 +3,7 @@ Main controller orchestrating the two-layer agent system (Ported from AgentContr
 """
 import asyncio
 import logging
+import time
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from collections import deque
@@ -64,6 +65,8 @@ class FeedMonitor:
             "alerts_triggered": 0,
             "start_time": datetime.now()
         }
+        # Uptime is measured on the monotonic clock so wall-clock jumps don't skew it
+        self._started_monotonic = time.monotonic()
 
         logger.info(f"FeedMonitor initialized for feed {config.get('camera', {}).get('id')}")
 
@@ -399,7 +402,7 @@ class FeedMonitor:
         return
 
     def get_statistics(self) -> Dict[str, Any]:
-        uptime = (datetime.now() - self.stats["start_time"]).total_seconds()
+        uptime = time.monotonic() - self._started_monotonic
         return {
             **self.stats,
             "uptime_seconds": uptime,
@@ -4,6 +4,7 @@ import time
 import asyncio
 from typing import Dict, Any
 from datetime import datetime
+from uuid import UUID
 
 # Load environment variables FIRST before any other imports
 from dotenv import load_dotenv
@@ -60,7 +61,7 @@ def get_sync_engine():
     return engine, session_factory
 
 
-async def get_feed_status(session_factory, feed_id: str) -> str:
+async def get_feed_status(session_factory, feed_id: UUID) -> str:
     """Helper to fetch current status from DB"""
     async with session_factory() as db:
         feed = await feed_crud.get(db, id=feed_id)
@@ -76,6 +77,8 @@ def monitor_feed_task(self, feed_id: str):
     This runs internally in an infinite loop until the feed status is changed to INACTIVE in the DB.
     """
     logger.info(f"Starting monitoring task for Feed ID: {feed_id}")
+    # Celery hands us a string; query with a real UUID so it binds as the native type
+    feed_uuid = UUID(feed_id)
     
     video_capture = None
     engine = None
@@ -88,7 +91,7 @@ def monitor_feed_task(self, feed_id: str):
         # Create task-specific engine and session factory (scoped to this event loop)
         engine, session_factory = get_sync_engine()
 
-        current_status = loop.run_until_complete(get_feed_status(session_factory, feed_id))
+        current_status = loop.run_until_complete(get_feed_status(session_factory, feed_uuid))
         if current_status != FeedStatus.ACTIVE.value:
             logger.info(f"Feed {feed_id} is not ACTIVE ({current_status}). Aborting task.")
             return
@@ -96,7 +99,7 @@ def monitor_feed_task(self, feed_id: str):
         # Fetch feed details
         async def get_feed_details():
             async with session_factory() as db:
-                return await feed_crud.get(db, id=feed_id)
+                return await feed_crud.get(db, id=feed_uuid)
         
         feed = loop.run_until_complete(get_feed_details())
         if not feed:
@@ -187,7 +190,7 @@ def monitor_feed_task(self, feed_id: str):
         while True:
             # A. Check Stop Signal
             if time.time() - last_check > check_interval:
-                current_status = loop.run_until_complete(get_feed_status(session_factory, feed_id))
+                current_status = loop.run_until_complete(get_feed_status(session_factory, feed_uuid))
                 if current_status != FeedStatus.ACTIVE.value:
                     logger.info(f"Stop signal received (Status={current_status}). Shutting down monitoring for {feed_id}.")
                     break
@@ -1,9 +1,13 @@
 from contextlib import asynccontextmanager
 import logging
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import Response
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import close_db, init_db
+from app.core.responses import ORJSONResponse
+from app.core.middleware import BodySizeLimitMiddleware, DBSessionMiddleware, ETagMiddleware
 from app.api.v1.router import api_router
 from app.worker.utils.logging_config import setup_logging
 
@@ -39,6 +43,7 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down application...")
     if manager.redis_client:
         await manager.redis_client.close()
+    await close_db()
 
 
 # Create FastAPI app
@@ -48,9 +53,24 @@ app = FastAPI(
     description="XMonitor API - Intelligent Safety Monitoring Backend",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
+# One DB session per request, shared by all dependencies (innermost, so it
+# outlives the handler until the response body is sent)
+app.add_middleware(DBSessionMiddleware)
+
+# ETag / 304 handling for GET responses (added before CORS so CORS wraps the 304s)
+app.add_middleware(ETagMiddleware)
+
+# Reject oversized uploads before FastAPI parses and spools the multipart body
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_size=settings.MAX_UPLOAD_SIZE,
+    paths=["/api/v1/media/upload"],
+)
+
 # CORS Middleware
 app.add_middleware(
     CORSMiddleware,
@@ -59,9 +79,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count"],
 )
 
 
+
+@app.exception_handler(StarletteHTTPException)
+async def http_exception_handler(request: Request, exc: StarletteHTTPException):
+    """Render HTTP errors (401/403/404 on every hot path) with orjson too"""
+    headers = getattr(exc, "headers", None)
+    if exc.status_code in (204, 304):
+        return Response(status_code=exc.status_code, headers=headers)
+    return ORJSONResponse({"detail": exc.detail}, status_code=exc.status_code, headers=headers)
+
+
 # Health check endpoint
 @app.get("/", tags=["health"])
 async def root():